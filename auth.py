@@ -2,12 +2,52 @@
 Yahoo Fantasy Sports API Authentication
 """
 import os
+import threading
+from functools import lru_cache
+
 from yahoo_oauth import OAuth2
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+# Connection pool sizing for the shared HTTP session.  Must be at least
+# the number of worker threads issuing concurrent API requests.
+POOL_SIZE = 32
+
+# Serializes the token check/refresh when clients are created from
+# several threads
+_oauth_lock = threading.Lock()
+
+
+def _mount_pooled_adapter(session):
+    """
+    Attach a keep-alive connection pool with retries to a requests session.
+
+    Args:
+        session: requests.Session used by the OAuth2 object
+    """
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    adapter = HTTPAdapter(
+        pool_connections=POOL_SIZE,
+        pool_maxsize=POOL_SIZE,
+        max_retries=Retry(total=3, backoff_factor=0.3,
+                          status_forcelist=[429, 500, 502, 503, 504]),
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers['Connection'] = 'keep-alive'
+
+
+@lru_cache(maxsize=None)
+def _load_oauth():
+    """Build the OAuth2 object (reads, and possibly refreshes, oauth2.json)."""
+    oauth = OAuth2(None, None, from_file='oauth2.json')
+    _mount_pooled_adapter(oauth.session)
+    return oauth
+
 
 def get_oauth():
     """
@@ -15,11 +55,24 @@ def get_oauth():
     
     This will open a browser window for the first time to authenticate.
     After that, it will store the token in oauth2.json for reuse.
+
+    The underlying HTTP session is given a pooled keep-alive adapter so
+    repeated (and concurrent) API calls reuse TCP/TLS connections.
+
+    A single OAuth2 instance is shared across the process, so oauth2.json
+    is only read and rewritten once.  It is rebuilt (refreshing the token)
+    only after the cached token has expired; the check and rebuild are
+    guarded by a lock so concurrent callers refresh it only once.
     
     Returns:
         OAuth2: Authenticated OAuth2 object
     """
-    return OAuth2(None, None, from_file='oauth2.json')
+    with _oauth_lock:
+        oauth = _load_oauth()
+        if not oauth.token_is_valid():
+            _load_oauth.cache_clear()
+            oauth = _load_oauth()
+    return oauth
 
 
 def setup_credentials():
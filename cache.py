@@ -0,0 +1,114 @@
+"""
+On-disk JSON cache for API responses that rarely change.
+
+Cached files live under CACHE_DIR and expire after a time-to-live.
+Set ``refresh`` on the decorated object (or delete the directory) to
+force fresh fetches.
+"""
+import functools
+import os
+import time
+
+import json_utils
+
+CACHE_DIR = '.cache'
+
+# League settings and stat categories are effectively static for a season
+SETTINGS_TTL = 24 * 60 * 60
+
+# Team names and keys change rarely, but can mid-season
+TEAMS_TTL = 60 * 60
+
+# Standings move as games finish, so they are only reused briefly, e.g.
+# across several report scripts run back to back
+STANDINGS_TTL = 15 * 60
+
+REFRESH_HELP = 'Ignore data cached by an earlier run and re-fetch it from the API'
+
+
+def add_refresh_argument(parser):
+    """
+    Add the --refresh flag shared by the command-line scripts.
+
+    Args:
+        parser: argparse.ArgumentParser to extend
+    """
+    parser.add_argument('--refresh', action='store_true', help=REFRESH_HELP)
+
+
+def read_cache(filename, ttl):
+    """
+    Load a cached JSON document if it exists and has not expired.
+
+    Args:
+        filename: File name inside CACHE_DIR
+        ttl: Maximum age in seconds
+
+    Returns:
+        The decoded object, or None on a miss
+    """
+    path = os.path.join(CACHE_DIR, filename)
+    try:
+        if time.time() - os.path.getmtime(path) > ttl:
+            return None
+        with open(path, 'rb') as f:
+            return json_utils.loads(f.read())
+    except (OSError, ValueError):
+        return None
+
+
+def write_cache(filename, data):
+    """
+    Store a JSON-serializable object in CACHE_DIR.
+
+    Failures are ignored; the cache is only an optimization.
+
+    Args:
+        filename: File name inside CACHE_DIR
+        data: Object to store
+    """
+    path = os.path.join(CACHE_DIR, filename)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(json_utils.dumps(data))
+    except (OSError, TypeError):
+        pass
+
+
+def disk_cache(ttl, key_fn):
+    """
+    Decorate a method so its JSON result is cached on disk.
+
+    Results are also kept on the instance, so repeated calls within a
+    run skip even the disk read.  Callers must treat them as read-only.
+    When the instance's ``refresh`` attribute is true the disk copy is
+    ignored, but the fresh result is still written for later runs.
+
+    Args:
+        ttl: Maximum age of a cached result in seconds
+        key_fn: Called with the method's ``self`` argument; returns
+                the cache file name
+
+    Returns:
+        The decorator
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            filename = key_fn(self)
+            memo = self.__dict__.setdefault('_disk_cache_memo', {})
+            if filename in memo:
+                return memo[filename]
+            result = None
+            if not getattr(self, 'refresh', False):
+                result = read_cache(filename, ttl)
+            if result is None:
+                result = func(self, *args, **kwargs)
+                if result:
+                    write_cache(filename, result)
+            if result:
+                memo[filename] = result
+            return result
+        return wrapper
+    return decorator
@@ -2,14 +2,75 @@
 Yahoo Fantasy Basketball API Client
 """
 import os
-import objectpath
-from yahoo_oauth import OAuth2
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
 from yahoo_fantasy_api import league, game, team
 from dotenv import load_dotenv
 
+import json_utils
+from auth import get_oauth
+from cache import SETTINGS_TTL, STANDINGS_TTL, TEAMS_TTL, disk_cache
+
 # Load environment variables
 load_dotenv()
 
+# Base URL of the Yahoo Fantasy Sports REST API
+YAHOO_API_URL = 'https://fantasysports.yahooapis.com/fantasy/v2'
+
+# Worker threads used for concurrent API requests
+MAX_WORKERS = 8
+
+# Maximum number of players the Yahoo player stats endpoint accepts per call
+PLAYER_STATS_BATCH_SIZE = 25
+
+# Non-stat keys on the rows returned by get_players_stats_all
+PLAYER_STATS_META_KEYS = frozenset({'player_id', 'name', 'position_type'})
+
+# Positions queried to cover every free agent
+FREE_AGENT_POSITIONS = ('PG', 'SG', 'SF', 'PF', 'C')
+
+# Resolved {league_id: league_key} mappings, persisted between runs.
+# Delete this file to force the league key to be looked up again.
+LEAGUE_KEY_CACHE_FILE = os.path.join('.cache', 'league_keys.json')
+
+
+def stat_key(stat_id):
+    """
+    Normalize a Yahoo stat_id into the interned string used as a dict key.
+
+    Every stat_id in a response is a fresh string (or an int), so interning
+    them gives all stats dicts a single shared object per id and lets
+    lookups against the module constants match by identity.
+
+    Args:
+        stat_id: stat_id as returned by the API (str or int)
+
+    Returns:
+        str: Interned stat_id string
+    """
+    return sys.intern(str(stat_id))
+
+
+def _load_league_keys():
+    """Load the persisted league_id -> league_key mapping."""
+    try:
+        with open(LEAGUE_KEY_CACHE_FILE, 'rb') as f:
+            data = json_utils.loads(f.read())
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _save_league_keys(league_keys):
+    """Persist the league_id -> league_key mapping."""
+    try:
+        os.makedirs(os.path.dirname(LEAGUE_KEY_CACHE_FILE), exist_ok=True)
+        with open(LEAGUE_KEY_CACHE_FILE, 'wb') as f:
+            f.write(json_utils.dumps(league_keys))
+    except OSError:
+        pass
+
 
 class FantasyBasketballClient:
     """Client for interacting with Yahoo Fantasy Basketball API"""
@@ -25,14 +86,17 @@ class FantasyBasketballClient:
         7: 'FTA',
     }
     
-    def __init__(self, league_id=None):
+    def __init__(self, league_id=None, refresh=False):
         """
         Initialize the client.
         
         Args:
             league_id: Yahoo Fantasy Basketball league ID (e.g., '21454')
+            refresh: If True, re-fetch responses kept in the disk cache
+                     (fresh responses are still cached for later runs)
         """
-        self.oauth = OAuth2(None, None, from_file='oauth2.json')
+        self.refresh = refresh
+        self.oauth = get_oauth()
         self.gm = game.Game(self.oauth, 'nba')
         self.league_id = league_id or os.getenv('LEAGUE_ID')
         
@@ -42,6 +106,7 @@ class FantasyBasketballClient:
         # Get the current season league key
         self.league_key = self._get_league_key()
         self.lg = league.League(self.oauth, self.league_key)
+        self._team_objs = {}
 
         # Augment the library's stats_id_map so player_stats() returns
         # ALL stat IDs (GP, FGM, FGA, FTM, FTA, etc.), not just scoring
@@ -55,7 +120,23 @@ class FantasyBasketballClient:
         """
         Get the full league key for the current season.
         Yahoo uses format like 'nba.l.21454' but we need to get the correct game_id.
+
+        The resolved key is cached on disk (LEAGUE_KEY_CACHE_FILE) so later
+        runs skip the ``league_ids()`` round-trip.
         """
+        league_keys = _load_league_keys()
+        league_key = league_keys.get(self.league_id)
+        if league_key:
+            return league_key
+
+        league_key = self._resolve_league_key()
+        if isinstance(league_key, str):
+            league_keys[self.league_id] = league_key
+            _save_league_keys(league_keys)
+        return league_key
+
+    def _resolve_league_key(self):
+        """Look up the league key for the current season via the API."""
         # Get current season game key
         game_keys = self.gm.league_ids()
         
@@ -70,19 +151,26 @@ class FantasyBasketballClient:
         current_season = self.gm.to_league(self.league_id)
         return current_season
     
+    @disk_cache(TEAMS_TTL, lambda self: f'teams_{self.league_key}.json')
     def get_teams(self):
         """
         Get all teams in the league.
-        
+
+        Cached on disk for TEAMS_TTL seconds.
+
         Returns:
             dict: Dictionary mapping team keys to team names
         """
         return self.lg.teams()
     
+    @disk_cache(STANDINGS_TTL,
+                lambda self: f'standings_{self.league_key}.json')
     def get_standings(self):
         """
         Get current league standings.
-        
+
+        Cached on disk for STANDINGS_TTL seconds.
+
         Returns:
             list: List of teams with their standings
         """
@@ -98,8 +186,7 @@ class FantasyBasketballClient:
         Returns:
             dict: Team statistics
         """
-        tm = team.Team(self.oauth, team_key)
-        return tm.stats()
+        return self._team(team_key).stats()
     
     def get_team_roster(self, team_key):
         """
@@ -111,13 +198,152 @@ class FantasyBasketballClient:
         Returns:
             list: List of players on the team
         """
-        tm = team.Team(self.oauth, team_key)
-        return tm.roster()
+        return self._team(team_key).roster()
+
+    def _team(self, team_key):
+        """Return a cached ``team.Team`` object for a team key."""
+        tm = self._team_objs.get(team_key)
+        if tm is None:
+            tm = team.Team(self.oauth, team_key)
+            self._team_objs[team_key] = tm
+        return tm
+
+    def _get_raw(self, uri):
+        """
+        GET a Yahoo Fantasy API resource and decode its JSON.
+
+        Equivalent to the library's ``yhandler.get()``, but the body is
+        decoded with json_utils (orjson when installed) rather than the
+        standard library parser behind ``response.json()``.
+
+        Args:
+            uri: Resource path relative to YAHOO_API_URL
+
+        Returns:
+            dict: Decoded ``fantasy_content`` response
+        """
+        response = self.oauth.session.get(
+            "{}/{}".format(YAHOO_API_URL, uri), params={'format': 'json'})
+        if response.status_code != 200:
+            raise RuntimeError(response.content)
+        return json_utils.loads(response.content)
+
+    def get_all_rosters(self, team_keys):
+        """
+        Get rosters for several teams in a single API request.
+
+        Uses the ``teams;team_keys=k1,k2,.../roster`` collection endpoint
+        instead of one ``team/{key}/roster`` call per team.  Players are
+        returned in the same shape as ``team.Team.roster()``, plus
+        ``editorial_team_abbr``.
+
+        Args:
+            team_keys: List of Yahoo team keys
+
+        Returns:
+            dict: ``{team_key: [player dicts]}``
+        """
+        if not team_keys:
+            return {}
+        raw = self._get_raw(
+            "teams;team_keys={}/roster".format(','.join(team_keys)))
+        return self._parse_rosters_raw(raw)
+
+    @staticmethod
+    def _parse_rosters_raw(raw):
+        """
+        Parse a raw ``teams/roster`` response into per-team player lists.
+
+        Args:
+            raw: JSON response from the teams roster collection
+
+        Returns:
+            dict: ``{team_key: [player dicts]}``
+        """
+        content = raw.get('fantasy_content', {}) if isinstance(raw, dict) else {}
+        teams = content.get('teams')
+        if not isinstance(teams, dict):
+            return {}
+
+        rosters = {}
+        for idx, entry in teams.items():
+            if idx == 'count' or not isinstance(entry, dict):
+                continue
+            team_parts = entry.get('team') or []
+            if not team_parts:
+                continue
+
+            team_key = None
+            for item in team_parts[0] if isinstance(team_parts[0], list) else []:
+                if isinstance(item, dict) and 'team_key' in item:
+                    team_key = item['team_key']
+                    break
+            if team_key is None:
+                continue
+
+            players = {}
+            for part in team_parts[1:]:
+                if isinstance(part, dict) and 'roster' in part:
+                    players = part['roster'].get('0', {}).get('players', {})
+
+            roster = []
+            for pidx, pentry in (players.items() if isinstance(players, dict) else []):
+                if pidx == 'count' or not isinstance(pentry, dict):
+                    continue
+                plyr = FantasyBasketballClient._parse_roster_player(
+                    pentry.get('player') or [])
+                if plyr is not None:
+                    roster.append(plyr)
+
+            rosters[team_key] = roster
+        return rosters
+
+    @staticmethod
+    def _parse_roster_player(player):
+        """
+        Parse one raw roster player entry.
+
+        Args:
+            player: Two-part list of (metadata list, selected_position dict)
+
+        Returns:
+            dict or None: Player dict, or None if it has no player_id
+        """
+        if not player:
+            return None
+        plyr = {'status': ''}
+        for item in player[0] if isinstance(player[0], list) else []:
+            if not isinstance(item, dict):
+                continue
+            if 'player_id' in item:
+                plyr['player_id'] = int(item['player_id'])
+            elif 'name' in item and isinstance(item['name'], dict):
+                plyr['name'] = item['name'].get('full', 'Unknown')
+            elif 'status' in item:
+                plyr['status'] = item['status']
+            elif 'editorial_team_abbr' in item:
+                plyr['editorial_team_abbr'] = item['editorial_team_abbr']
+            elif 'position_type' in item:
+                plyr['position_type'] = item['position_type']
+            elif 'eligible_positions' in item:
+                plyr['eligible_positions'] = [
+                    p['position'] for p in item['eligible_positions']
+                    if isinstance(p, dict) and 'position' in p]
+        for part in player[1:]:
+            if isinstance(part, dict) and 'selected_position' in part:
+                for sp in part['selected_position']:
+                    if isinstance(sp, dict) and 'position' in sp:
+                        plyr['selected_position'] = sp['position']
+        return plyr if 'player_id' in plyr else None
     
+    @disk_cache(SETTINGS_TTL,
+                lambda self: f'league_settings_{self.league_key}.json')
     def get_league_settings(self):
         """
         Get league settings including scoring categories.
-        
+
+        Cached on disk for SETTINGS_TTL seconds.
+
         Returns:
             dict: League settings
         """
@@ -134,10 +360,36 @@ class FantasyBasketballClient:
             list: List of stat category dicts, each containing at least
                   ``stat_id`` and ``display_name``.
         """
-        raw = self.lg.yhandler.get_settings_raw(self.lg.league_id)
-        t = objectpath.Tree(raw)
+        return self._parse_stat_categories_raw(self._get_settings_raw())
+
+    @disk_cache(SETTINGS_TTL,
+                lambda self: f'settings_raw_{self.league_key}.json')
+    def _get_settings_raw(self):
+        """Fetch the raw league settings JSON, cached for SETTINGS_TTL."""
+        return self._get_raw("league/{}/settings".format(self.lg.league_id))
+
+    @staticmethod
+    def _parse_stat_categories_raw(raw):
+        """
+        Extract the stat category dicts from a raw league settings response.
+
+        Walks ``fantasy_content.league[1].settings[0].stat_categories.stats``
+        directly instead of searching the whole document.
+
+        Args:
+            raw: JSON response from ``get_settings_raw``
+
+        Returns:
+            list: Stat category dicts that contain a ``stat_id``.
+        """
+        try:
+            settings = raw['fantasy_content']['league'][1]['settings'][0]
+            stats = settings['stat_categories']['stats']
+        except (KeyError, IndexError, TypeError):
+            return []
         categories = []
-        for s in t.execute('$..stat_categories..stat'):
+        for entry in stats:
+            s = entry.get('stat') if isinstance(entry, dict) else None
             if isinstance(s, dict) and 'stat_id' in s:
                 categories.append(s)
         return categories
@@ -170,7 +422,7 @@ class FantasyBasketballClient:
             return []
         return self.lg.player_stats(player_keys, req_type)
 
-    def get_players_stats_all(self, player_keys, req_type='season'):
+    def get_players_stats_all(self, player_keys, req_type='season', on_error=None):
         """
         Get stats for multiple players, returning ALL stat IDs.
 
@@ -180,48 +432,131 @@ class FantasyBasketballClient:
         FTM, FTA, and all other stat IDs.
 
         Stats are keyed by stat_id strings (e.g. ``'0'`` for GP,
-        ``'12'`` for PTS).
+        ``'12'`` for PTS).  Keys are requested in batches of
+        PLAYER_STATS_BATCH_SIZE, issued concurrently.
 
         Args:
             player_keys: List of Yahoo player keys/IDs
             req_type: Type of stats request ('season' for season totals)
+            on_error: Optional ``callback(batch_num, num_batches, error)``.
+                      If given, a failed batch is reported through it and
+                      skipped; otherwise the first failure is raised.
 
         Returns:
             list: List of dicts, each with ``player_id``, ``name``, and
-                  stat values keyed by stat_id strings.
+                  stat values keyed by stat_id strings, in key order.
         """
         if not player_keys:
             return []
-        results = []
-        for batch_start in range(0, len(player_keys), 25):
-            batch = player_keys[batch_start:batch_start + 25]
+        batches = [
+            player_keys[i:i + PLAYER_STATS_BATCH_SIZE]
+            for i in range(0, len(player_keys), PLAYER_STATS_BATCH_SIZE)
+        ]
+
+        def fetch_batch(batch):
             raw = self.lg.yhandler.get_player_stats_raw(
                 self.lg.league_id, batch, req_type, None, None, None)
-            t = objectpath.Tree(raw)
-            row = None
-            for e in t.execute('$..(full,player_id,position_type,stat)'):
-                if 'player_id' in e:
-                    if row is not None:
-                        results.append(row)
-                    row = {'player_id': int(e['player_id'])}
-                elif 'full' in e:
-                    if row is not None:
-                        row['name'] = e['full']
-                elif 'position_type' in e:
-                    if row is not None:
-                        row['position_type'] = e['position_type']
-                elif 'stat' in e:
-                    if row is not None:
-                        stat_id = str(e['stat']['stat_id'])
-                        try:
-                            val = float(e['stat']['value'])
-                        except (ValueError, TypeError):
-                            val = e['stat']['value']
-                        row[stat_id] = val
-            if row is not None:
-                results.append(row)
+            return self._parse_player_stats_raw(raw)
+
+        # Batches are independent requests; results are merged in
+        # submission order so rows keep the order of player_keys.
+        results = []
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+            futures = [pool.submit(fetch_batch, batch) for batch in batches]
+            for batch_num, future in enumerate(futures, 1):
+                try:
+                    results.extend(future.result())
+                except Exception as e:
+                    if on_error is None:
+                        raise
+                    on_error(batch_num, len(batches), e)
+        return results
+
+    @classmethod
+    def _parse_player_stats_raw(cls, raw):
+        """
+        Parse a raw player stats response into one dict per player.
+
+        Args:
+            raw: JSON response from ``get_player_stats_raw``
+
+        Returns:
+            list: List of dicts with ``player_id``, ``name``,
+                  ``position_type`` and stat values keyed by stat_id strings.
+        """
+        results = []
+        for player_id, name, position_type, stat_list in cls._iter_players(raw):
+            row = {'player_id': player_id}
+            if name is not None:
+                row['name'] = name
+            if position_type is not None:
+                row['position_type'] = position_type
+            for stat in stat_list:
+                stat_id = stat_key(stat['stat_id'])
+                try:
+                    val = float(stat['value'])
+                except (ValueError, TypeError):
+                    val = stat['value']
+                row[stat_id] = val
+            results.append(row)
         return results
 
+    @staticmethod
+    def _iter_players(raw):
+        """
+        Walk the ``players`` collection of a raw Yahoo response.
+
+        Handles both ``fantasy_content.players`` and the league-scoped
+        ``fantasy_content.league[1].players`` layouts.  Each player is a
+        two-part list: a metadata list of single-key dicts, followed by a
+        dict holding ``player_stats``.
+
+        Args:
+            raw: JSON response containing a players collection
+
+        Yields:
+            tuple: ``(player_id, name, position_type, stat_list)`` where
+                   ``stat_list`` is a list of ``{stat_id, value}`` dicts.
+        """
+        content = raw.get('fantasy_content', {}) if isinstance(raw, dict) else {}
+        players = content.get('players')
+        if players is None:
+            league_part = content.get('league')
+            if isinstance(league_part, list) and len(league_part) > 1:
+                players = league_part[1].get('players')
+        if not isinstance(players, dict):
+            return
+
+        for idx, entry in players.items():
+            if idx == 'count' or not isinstance(entry, dict):
+                continue
+            player = entry.get('player')
+            if not player:
+                continue
+
+            player_id = name = position_type = None
+            metadata = player[0] if isinstance(player[0], list) else []
+            for item in metadata:
+                if not isinstance(item, dict):
+                    continue
+                if 'player_id' in item:
+                    player_id = int(item['player_id'])
+                elif 'name' in item and isinstance(item['name'], dict):
+                    name = item['name'].get('full')
+                elif 'position_type' in item:
+                    position_type = item['position_type']
+            if player_id is None:
+                continue
+
+            stat_list = []
+            for part in player[1:]:
+                if isinstance(part, dict) and 'player_stats' in part:
+                    for s in part['player_stats'].get('stats', []):
+                        if isinstance(s, dict) and 'stat' in s:
+                            stat_list.append(s['stat'])
+
+            yield player_id, name, position_type, stat_list
+
     def get_all_teams_stats(self):
         """
         Get season stats for ALL teams directly from the Yahoo API.
@@ -234,31 +569,86 @@ class FantasyBasketballClient:
         Returns:
             dict: ``{team_key: {stat_id_str: float_value}}``
         """
-        raw = self.lg.yhandler.get(
+        raw = self._get_raw(
             "league/{}/teams/stats".format(self.lg.league_id))
-        t = objectpath.Tree(raw)
+        return self._parse_teams_stats_raw(raw)
+
+    @staticmethod
+    def _parse_teams_stats_raw(raw):
+        """
+        Parse a raw ``league/teams/stats`` response.
+
+        Walks ``fantasy_content.league[1].teams`` directly; each team is
+        ``[[metadata...], {"team_stats": {"stats": [{"stat": ...}]}}, ...]``.
+
+        Args:
+            raw: JSON response from the teams stats endpoint
+
+        Returns:
+            dict: ``{team_key: {stat_id_str: float_value}}``
+        """
+        try:
+            teams = raw['fantasy_content']['league'][1]['teams']
+        except (KeyError, IndexError, TypeError):
+            return {}
+        if not isinstance(teams, dict):
+            return {}
+
         result = {}
-        team_key = None
-        for e in t.execute('$..(team_key,stat)'):
-            if 'team_key' in e:
-                team_key = e['team_key']
-                if team_key not in result:
-                    result[team_key] = {}
-            elif 'stat' in e and team_key is not None:
-                sid = str(e['stat'].get('stat_id', ''))
-                val_str = e['stat'].get('value', '')
-                if sid and val_str not in ('', '-', None):
-                    try:
-                        result[team_key][sid] = float(val_str)
-                    except (ValueError, TypeError):
-                        pass
+        for idx, entry in teams.items():
+            if idx == 'count' or not isinstance(entry, dict):
+                continue
+            team_parts = entry.get('team') or []
+            if not team_parts or not isinstance(team_parts[0], list):
+                continue
+
+            team_key = None
+            for item in team_parts[0]:
+                if isinstance(item, dict) and 'team_key' in item:
+                    team_key = item['team_key']
+                    break
+            if team_key is None:
+                continue
+
+            stats = result.setdefault(team_key, {})
+            for part in team_parts[1:]:
+                if not isinstance(part, dict) or 'team_stats' not in part:
+                    continue
+                for e in part['team_stats'].get('stats', []):
+                    stat = e.get('stat') if isinstance(e, dict) else None
+                    if not isinstance(stat, dict):
+                        continue
+                    sid = stat_key(stat.get('stat_id', ''))
+                    val_str = stat.get('value', '')
+                    if sid and val_str not in ('', '-', None):
+                        try:
+                            stats[sid] = float(val_str)
+                        except (ValueError, TypeError):
+                            pass
         return result
 
-    def get_all_players(self):
+    def get_all_free_agents(self):
         """
-        Get all available players in the league.
-        
+        Get all free agents in the league across every position.
+
+        Each position is a separate paginated ``free_agents()`` query, so
+        the positions are fetched concurrently.  Players eligible at more
+        than one position are returned once.
+
         Returns:
-            list: List of players
+            list: Free agent player dicts, in position order
         """
-        return self.lg.free_agents('PG')  # Returns available players
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+            results = list(pool.map(self.lg.free_agents,
+                                    FREE_AGENT_POSITIONS))
+
+        seen = set()
+        players = []
+        for position_players in results:
+            for plyr in position_players:
+                pid = plyr.get('player_id')
+                if pid in seen:
+                    continue
+                seen.add(pid)
+                players.append(plyr)
+        return players
@@ -8,17 +8,164 @@ Generates a single JSON file that can be fed into an AI assistant
 Usage:
     python export_data.py
     python export_data.py --output my_league.json
+    python export_data.py --gzip --compact
 """
 import argparse
-import json
+import gzip
 import sys
+from dataclasses import dataclass
 from datetime import datetime
+from typing import Optional, Union
 
+import json_utils
 from league_data import LeagueData
 
 
 NBA_TOTAL_GAMES = 82
 
+# Low gzip levels are nearly as fast as an uncompressed write on this data
+GZIP_COMPRESSLEVEL = 3
+
+# Percentage stats (FG%, FT%) have no per-game average
+PCT_STAT_IDS = frozenset({'5', '8'})
+
+# (stat_id, name) of the component stats exported alongside the Roto
+# categories (league_data.COMPONENT_STATS maps percentages to them)
+EXPORT_COMPONENT_STATS = (('3', 'FGM'), ('4', 'FGA'),
+                          ('6', 'FTM'), ('7', 'FTA'))
+
+
+@dataclass
+class PlayerEntry:
+    """One rostered player in the export (serialized as a JSON object)."""
+    __slots__ = ('player_id', 'name', 'position', 'nba_team',
+                 'games_played', 'games_left', 'season_totals',
+                 'per_game_averages')
+
+    player_id: Union[int, str]  # Player key; int when Yahoo only gave an id
+    name: str
+    position: str
+    nba_team: str
+    games_played: Optional[int]
+    games_left: Optional[int]
+    season_totals: dict
+    per_game_averages: dict
+
+
+def build_team_data(ld, team_key, team_name, stat_columns, avg_columns):
+    """
+    Build the export entry for one team.
+
+    Args:
+        ld: Populated LeagueData instance
+        team_key: Yahoo team key
+        team_name: Team display name
+        stat_columns: List of (stat_id, stat_name) for Roto categories
+        avg_columns: Subset of stat_columns used for per-game averages
+
+    Returns:
+        dict: Team totals and a roster list of PlayerEntry objects
+    """
+    team_data = {
+        'name': team_name,
+        'team_key': team_key,
+        'team_totals': {},
+        'roster': [],
+    }
+
+    # Team totals (computed from player sums)
+    team_stats = ld.team_stats.get(team_key, {})
+    for sid, stat_name in stat_columns:
+        val = team_stats.get(sid)
+        if val is not None:
+            team_data['team_totals'][stat_name] = val
+    # Include GP and component stats in team totals
+    gp_total = team_stats.get('0')
+    if gp_total is not None:
+        team_data['team_totals']['GP'] = gp_total
+    for comp_id, comp_name in EXPORT_COMPONENT_STATS:
+        val = team_stats.get(comp_id)
+        if val is not None:
+            team_data['team_totals'][comp_name] = val
+
+    # Player details
+    player_keys = ld.get_team_player_keys(team_key)
+    for pkey in player_keys:
+        info = ld.player_info.get(pkey, {})
+        pstats = ld.player_stats.get(pkey, {})
+
+        # Normalize games played once for every use below
+        try:
+            games_played = int(float(pstats.get('0', 0)))
+        except (TypeError, ValueError):
+            games_played = None
+        games_left = (NBA_TOTAL_GAMES - games_played
+                      if games_played is not None else None)
+
+        player_entry = PlayerEntry(
+            player_id=pkey,
+            name=info.get('name', 'Unknown'),
+            position=info.get('position', 'N/A'),
+            nba_team=info.get('team', ''),
+            games_played=games_played,
+            games_left=games_left,
+            season_totals={
+                name: pstats[sid] for sid, name in stat_columns
+                if pstats.get(sid) is not None
+            },
+            per_game_averages={},
+        )
+
+        # Per-game averages, computed in one pass over avg_columns
+        if games_played is not None and games_played > 0:
+            player_entry.per_game_averages = {
+                name: round(pstats[sid] / games_played, 2)
+                for sid, name in avg_columns
+                if pstats.get(sid) is not None
+            }
+
+        # Component stats
+        for comp_id, comp_name in EXPORT_COMPONENT_STATS:
+            val = pstats.get(comp_id)
+            if val is not None:
+                player_entry.season_totals[comp_name] = val
+
+        team_data['roster'].append(player_entry)
+
+    return team_data
+
+
+def write_export(path, metadata, team_entries, indent=True, compress=False):
+    """
+    Stream the export to disk one team at a time.
+
+    Writes ``{"metadata": ..., "teams": {team_key: team_data, ...}}``
+    without holding every team's data in memory at once.
+
+    Args:
+        path: Output file path
+        metadata: Metadata dict
+        team_entries: Iterable of (team_key, team_data) pairs
+        indent: If True, pretty-print each section
+        compress: If True, write gzip-compressed output
+    """
+    if compress:
+        f = gzip.open(path, 'wb', compresslevel=GZIP_COMPRESSLEVEL)
+    else:
+        f = open(path, 'wb')
+    with f:
+        f.write(b'{"metadata": ')
+        f.write(json_utils.dumps(metadata, indent=indent))
+        f.write(b',\n"teams": {')
+        for i, (team_key, team_data) in enumerate(team_entries):
+            if i:
+                f.write(b',')
+            f.write(b'\n')
+            f.write(json_utils.dumps(team_key))
+            f.write(b': ')
+            f.write(json_utils.dumps(team_data, indent=indent))
+        f.write(b'\n}}\n')
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -29,17 +176,25 @@ def main():
         default='league_export.json',
         help='Output JSON file path (default: league_export.json)'
     )
+    parser.add_argument(
+        '--gzip',
+        action='store_true',
+        help='Write gzip-compressed output to <output>.gz'
+    )
+    parser.add_argument(
+        '--compact',
+        action='store_true',
+        help='Write JSON without indentation'
+    )
     args = parser.parse_args()
+    output_path = args.output + '.gz' if args.gzip else args.output
 
     try:
         print("Connecting to Yahoo Fantasy Basketball API...")
         ld = LeagueData()
 
-        print("Fetching league settings...")
-        ld.fetch_settings()
-
-        print("Fetching standings...")
-        ld.fetch_standings()
+        print("Fetching league settings and standings...")
+        ld.fetch_settings_and_standings()
 
         print(f"Found {len(ld.teams)} teams in league {ld.client.league_id}")
 
@@ -52,97 +207,34 @@ def main():
         total_players = sum(len(r) for r in ld.rosters.values())
         print(f"Loaded stats for {len(ld.player_stats)} of {total_players} players")
 
-        # Build export data
-        export = {
-            'metadata': {
-                'league_id': ld.client.league_id,
-                'exported_at': datetime.now().isoformat(),
-                'season': '2025-2026',
-                'nba_total_games': NBA_TOTAL_GAMES,
-                'stat_categories': [
-                    ld.get_stat_name(sid) for sid in ld.roto_stat_ids
-                ],
-                'stat_id_map': ld.stat_id_map,
-                'roto_stat_ids': ld.roto_stat_ids,
-                'negative_stats': list(ld.negative_stats),
-            },
-            'teams': {},
+        metadata = {
+            'league_id': ld.client.league_id,
+            'exported_at': datetime.now().isoformat(),
+            'season': '2025-2026',
+            'nba_total_games': NBA_TOTAL_GAMES,
+            'stat_categories': [
+                ld.get_stat_name(sid) for sid in ld.roto_stat_ids
+            ],
+            'stat_id_map': ld.stat_id_map,
+            'roto_stat_ids': ld.roto_stat_ids,
+            'negative_stats': list(ld.negative_stats),
         }
 
-        for team_key, team_name in ld.teams.items():
-            team_data = {
-                'name': team_name,
-                'team_key': team_key,
-                'team_totals': {},
-                'roster': [],
-            }
-
-            # Team totals (computed from player sums)
-            team_stats = ld.team_stats.get(team_key, {})
-            for sid in ld.roto_stat_ids:
-                stat_name = ld.get_stat_name(sid)
-                val = team_stats.get(sid)
-                if val is not None:
-                    team_data['team_totals'][stat_name] = val
-            # Include GP and component stats in team totals
-            gp_total = team_stats.get('0')
-            if gp_total is not None:
-                team_data['team_totals']['GP'] = gp_total
-            for comp_id, comp_name in [('3', 'FGM'), ('4', 'FGA'),
-                                       ('6', 'FTM'), ('7', 'FTA')]:
-                val = team_stats.get(comp_id)
-                if val is not None:
-                    team_data['team_totals'][comp_name] = val
-
-            # Player details
-            player_keys = ld.get_team_player_keys(team_key)
-            for pkey in player_keys:
-                info = ld.player_info.get(pkey, {})
-                pstats = ld.player_stats.get(pkey, {})
-
-                gp = pstats.get('0', 0)
-                games_left = (NBA_TOTAL_GAMES - int(gp)
-                              if isinstance(gp, (int, float)) else None)
-
-                player_entry = {
-                    'player_id': pkey,
-                    'name': info.get('name', 'Unknown'),
-                    'position': info.get('position', 'N/A'),
-                    'nba_team': info.get('team', ''),
-                    'games_played': (int(gp) if isinstance(gp, (int, float))
-                                     else None),
-                    'games_left': games_left,
-                    'season_totals': {},
-                    'per_game_averages': {},
-                }
-
-                for sid in ld.roto_stat_ids:
-                    stat_name = ld.get_stat_name(sid)
-                    val = pstats.get(sid)
-                    if val is not None:
-                        player_entry['season_totals'][stat_name] = val
-                        # Per-game averages (skip percentages)
-                        if (sid not in ('5', '8')
-                                and isinstance(gp, (int, float)) and gp > 0):
-                            player_entry['per_game_averages'][stat_name] = (
-                                round(val / gp, 2))
-
-                # Component stats
-                for comp_id, comp_name in [('3', 'FGM'), ('4', 'FGA'),
-                                           ('6', 'FTM'), ('7', 'FTA')]:
-                    val = pstats.get(comp_id)
-                    if val is not None:
-                        player_entry['season_totals'][comp_name] = val
-
-                team_data['roster'].append(player_entry)
-
-            export['teams'][team_key] = team_data
-
-        # Write JSON
-        with open(args.output, 'w') as f:
-            json.dump(export, f, indent=2, default=str)
-
-        print(f"\n✅ Data exported to {args.output}")
+        # Resolve stat columns once; per-game averages skip percentages
+        stat_columns = [(sid, ld.get_stat_name(sid)) for sid in ld.roto_stat_ids]
+        avg_columns = [(sid, name) for sid, name in stat_columns
+                       if sid not in PCT_STAT_IDS]
+
+        # Each team is built and serialized before the next one
+        team_entries = (
+            (team_key, build_team_data(ld, team_key, team_name,
+                                       stat_columns, avg_columns))
+            for team_key, team_name in ld.teams.items()
+        )
+        write_export(output_path, metadata, team_entries,
+                     indent=not args.compact, compress=args.gzip)
+
+        print(f"\n✅ Data exported to {output_path}")
         print(f"   {len(ld.teams)} teams, {len(ld.player_stats)} players with stats")
         print(f"\n   You can feed this file into an AI assistant for trade analysis.")
 
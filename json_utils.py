@@ -0,0 +1,60 @@
+"""
+JSON helpers backed by orjson when it is available.
+
+orjson encodes and decodes in C and is several times faster than the
+standard library ``json`` module, which is kept as a fallback so orjson
+remains an optional dependency.
+"""
+import dataclasses
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(obj):
+    """Encode dataclass instances as dicts and anything else with str()."""
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    return str(obj)
+
+
+def dumps(obj, indent=False):
+    """
+    Serialize an object to UTF-8 encoded JSON bytes.
+
+    Dataclass instances are encoded as objects.  Other values that are
+    not natively JSON-serializable are converted with ``str()``, matching
+    ``json.dump(..., default=str)``.
+
+    Args:
+        obj: Object to serialize
+        indent: If True, pretty-print with a two-space indent
+
+    Returns:
+        bytes: Encoded JSON document
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=_default, option=option)
+    return json.dumps(obj, indent=2 if indent else None,
+                      default=_default).encode('utf-8')
+
+
+def loads(data):
+    """
+    Parse a JSON document.
+
+    Args:
+        data: JSON as ``bytes`` or ``str``
+
+    Returns:
+        The decoded Python object
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
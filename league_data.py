@@ -4,7 +4,12 @@ LeagueData - Data Ingestion Class for Fantasy Basketball Roto Analysis.
 Fetches and stores league settings, standings, rosters, and player stats
 from the Yahoo Fantasy Sports API.
 """
-from client import FantasyBasketballClient
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+from cache import read_cache, write_cache
+from client import (FantasyBasketballClient, MAX_WORKERS,
+                    PLAYER_STATS_META_KEYS, stat_key)
 
 
 # Default Roto stat categories (Yahoo stat_id -> name)
@@ -26,6 +31,9 @@ COMPONENT_STATS = {
     'FT%': {'made': '6', 'attempted': '7'},   # FTM / FTA
 }
 
+# Fetched league data is reused between runs for this many seconds
+LEAGUE_DATA_TTL = 6 * 60 * 60
+
 
 class LeagueData:
     """
@@ -34,7 +42,7 @@ class LeagueData:
     Attributes:
         client: FantasyBasketballClient instance
         stat_id_map: Mapping of stat_id to display name
-        reverse_stat_map: Mapping of display_name to stat_id (for flat API responses)
+        reverse_stat_map: Mapping of display_name to stat_id
         roto_stat_ids: List of stat IDs used in Roto scoring
         teams: Dict of team_key -> team_name
         standings_raw: Raw standings data from API
@@ -56,12 +64,15 @@ class LeagueData:
         self.reverse_stat_map = {}
         self.roto_stat_ids = []
         self.negative_stats = set()  # Stats where lower is better (e.g., TO)
+        self._stat_names = {}  # Resolved get_stat_name() results
         self.teams = {}
         self.standings_raw = []
         self.team_stats = {}
         self.rosters = {}
         self.player_stats = {}
         self.player_info = {}
+        # {team_key: (roster, player_keys, active_player_keys)}
+        self._roster_keys = {}
 
     @staticmethod
     def _get_player_key(player):
@@ -71,12 +82,91 @@ class LeagueData:
             pkey = player.get('player_id', '')
         return pkey
 
-    def fetch_all(self):
-        """Fetch all data from the API in sequence."""
-        self.fetch_settings()
-        self.fetch_standings()
+    def fetch_all(self, refresh=False):
+        """
+        Fetch all data from the API.
+
+        Args:
+            refresh: If True, ignore data cached by an earlier run, both
+                     this class's league data file and the client's
+                     cached API responses
+
+        Returns:
+            bool: True if the data was loaded from the cache
+        """
+        if refresh:
+            self.client.refresh = True
+        elif self.load_cache():
+            return True
+        self.fetch_settings_and_standings()
         self.fetch_rosters()
         self.fetch_player_stats()
+        self.save_cache()
+        return False
+
+    def _cache_file(self):
+        """Cache file name for this league's data, one per day."""
+        return f'league_data_{self.client.league_id}_{date.today().isoformat()}.json'
+
+    def save_cache(self):
+        """
+        Store the fetched data in the on-disk cache.
+
+        Player-keyed dicts are stored as [key, value] pairs because JSON
+        object keys are always strings and player keys may be ints.
+        """
+        write_cache(self._cache_file(), {
+            'stat_id_map': self.stat_id_map,
+            'reverse_stat_map': self.reverse_stat_map,
+            'roto_stat_ids': self.roto_stat_ids,
+            'negative_stats': sorted(self.negative_stats),
+            'stat_names': self._stat_names,
+            'teams': self.teams,
+            'standings_raw': self.standings_raw,
+            'team_stats': self.team_stats,
+            'rosters': self.rosters,
+            'player_stats': list(self.player_stats.items()),
+            'player_info': list(self.player_info.items()),
+        })
+
+    def load_cache(self):
+        """
+        Load data stored by save_cache() within LEAGUE_DATA_TTL.
+
+        Returns:
+            bool: True if cached data was loaded
+        """
+        data = read_cache(self._cache_file(), LEAGUE_DATA_TTL)
+        if not isinstance(data, dict):
+            return False
+        try:
+            self.stat_id_map = data['stat_id_map']
+            self.reverse_stat_map = data['reverse_stat_map']
+            self.roto_stat_ids = data['roto_stat_ids']
+            self.negative_stats = set(data['negative_stats'])
+            self._stat_names = data['stat_names']
+            self.teams = data['teams']
+            self.standings_raw = data['standings_raw']
+            self.team_stats = data['team_stats']
+            self.rosters = data['rosters']
+            self.player_stats = dict(data['player_stats'])
+            self.player_info = dict(data['player_info'])
+        except (KeyError, TypeError, ValueError):
+            return False
+        return True
+
+    def fetch_settings_and_standings(self):
+        """
+        Fetch league settings and standings concurrently.
+
+        The two requests only depend on the league, and they populate
+        disjoint attributes, so they can run at the same time.
+        """
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            settings = pool.submit(self.fetch_settings)
+            standings = pool.submit(self.fetch_standings)
+            settings.result()
+            standings.result()
 
     def fetch_settings(self):
         """
@@ -94,7 +184,7 @@ class LeagueData:
         self.roto_stat_ids = []
 
         for cat in raw_categories:
-            stat_id = str(cat.get('stat_id', ''))
+            stat_id = stat_key(cat.get('stat_id', ''))
             display_name = cat.get('display_name', f'Stat {stat_id}')
             self.stat_id_map[stat_id] = display_name
 
@@ -130,6 +220,13 @@ class LeagueData:
             if dname not in self.reverse_stat_map:
                 self.reverse_stat_map[dname] = sid
 
+        # Resolve display names once so get_stat_name is a single lookup
+        self._stat_names = {
+            sid: self.stat_id_map.get(sid, DEFAULT_ROTO_STATS.get(
+                sid, f'Stat {sid}'))
+            for sid in set(self.stat_id_map) | set(DEFAULT_ROTO_STATS)
+        }
+
     def fetch_standings(self):
         """
         Fetch current standings and team season stat totals from the API.
@@ -161,40 +258,76 @@ class LeagueData:
         self.rosters = {}
         self.player_info = {}
 
+        # One teams;team_keys=.../roster request covers the whole league.
+        # If it fails, fall back to per-team requests.
+        try:
+            fetched = self.client.get_all_rosters(list(self.teams))
+        except Exception as e:
+            print(f"  Warning: Batched roster fetch failed ({e}); "
+                  f"fetching rosters per team")
+            fetched = self._fetch_rosters_per_team()
+
         for team_key in self.teams:
-            try:
-                roster = self.client.get_team_roster(team_key)
-                self.rosters[team_key] = roster
-
-                for player in roster:
-                    pkey = self._get_player_key(player)
-                    if not pkey:
-                        continue
-                    pname = player.get('name', 'Unknown')
-                    if isinstance(pname, dict):
-                        pname = pname.get('full', 'Unknown')
-                    position = player.get('selected_position', {})
-                    if isinstance(position, dict):
-                        position = position.get('position', 'N/A')
-                    editorial_team = player.get('editorial_team_abbr', '')
-
-                    self.player_info[pkey] = {
-                        'name': pname,
-                        'position': str(position),
-                        'team': editorial_team,
-                        'team_key': team_key,
-                    }
-            except Exception as e:
-                print(f"  Warning: Could not fetch roster for {self.teams.get(team_key, team_key)}: {e}")
+            roster = fetched.get(team_key)
+            if roster is None:
+                if team_key not in fetched:
+                    print(f"  Warning: No roster returned for {self.teams.get(team_key, team_key)}")
                 self.rosters[team_key] = []
+                continue
+            self.rosters[team_key] = roster
+
+            for player in roster:
+                pkey = self._get_player_key(player)
+                if not pkey:
+                    continue
+                pname = player.get('name', 'Unknown')
+                if isinstance(pname, dict):
+                    pname = pname.get('full', 'Unknown')
+                position = player.get('selected_position', {})
+                if isinstance(position, dict):
+                    position = position.get('position', 'N/A')
+                editorial_team = player.get('editorial_team_abbr', '')
+
+                self.player_info[pkey] = {
+                    'name': pname,
+                    'position': str(position),
+                    'team': editorial_team,
+                    'team_key': team_key,
+                }
+
+    def _fetch_rosters_per_team(self):
+        """
+        Fetch each team's roster with its own request.
+
+        Roster requests are independent and I/O-bound, so they are
+        issued concurrently.
+
+        Returns:
+            dict: ``{team_key: roster}``; roster is None if the fetch failed
+        """
+        rosters = {}
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+            futures = {
+                team_key: pool.submit(self.client.get_team_roster, team_key)
+                for team_key in self.teams
+            }
+            for team_key, future in futures.items():
+                try:
+                    rosters[team_key] = future.result()
+                except Exception as e:
+                    print(f"  Warning: Could not fetch roster for {self.teams.get(team_key, team_key)}: {e}")
+                    rosters[team_key] = None
+        return rosters
 
     def fetch_player_stats(self):
         """
         Fetch season stats for all rostered players.
 
-        Uses the library's ``player_stats()`` method (with augmented
-        ``stats_id_map``) which returns ALL stat IDs including GP, FGM,
-        FGA, FTM, FTA keyed by display name.
+        Uses the client's ``get_players_stats_all()``, which parses the raw
+        API response into rows keyed by stat_id, so every stat is present
+        (GP, FGM, FGA, FTM, FTA included).  Players from every team are
+        requested together; the client splits them into concurrent
+        batches of up to 25 and a failed batch only loses its players.
 
         Populates self.player_stats with {player_id: {stat_id: value}}.
 
@@ -203,111 +336,101 @@ class LeagueData:
         """
         self.player_stats = {}
 
-        for team_key, roster in self.rosters.items():
-            player_keys = self.get_team_player_keys(team_key)
-            if not player_keys:
+        # The player stats endpoint is not team-scoped, so request every
+        # rostered player league-wide instead of issuing one call per team.
+        all_keys = list(dict.fromkeys(
+            pkey
+            for team_key in self.rosters
+            for pkey in self.get_team_player_keys(team_key)
+        ))
+
+        def report(batch_num, num_batches, error):
+            print(f"  Warning: Could not fetch player stats "
+                  f"for batch {batch_num} of {num_batches}: {error}")
+
+        for ps in self.client.get_players_stats_all(all_keys, 'season',
+                                                    on_error=report):
+            pid = ps.get('player_id', '')
+            if not pid:
                 continue
-
-            try:
-                stats_response = self.client.get_players_stats(
-                    player_keys, 'season')
-                if isinstance(stats_response, list):
-                    for ps in stats_response:
-                        pid = ps.get('player_id', '')
-                        if not pid:
-                            continue
-                        # Convert display-name-keyed stats to stat_id-keyed
-                        pstats = {}
-                        for key, value in ps.items():
-                            if key in self.reverse_stat_map and isinstance(
-                                    value, (int, float)):
-                                pstats[self.reverse_stat_map[key]] = value
-                        self.player_stats[pid] = pstats
-            except Exception as e:
-                team_name = self.teams.get(team_key, team_key)
-                print(f"  Warning: Could not fetch player stats "
-                      f"for {team_name}: {e}")
+            self.player_stats[pid] = self._extract_stats(ps)
 
     def _extract_stats(self, player_data):
         """
-        Extract stat values from a player stats API response.
+        Extract stat values from one normalized player stats row.
 
-        Handles two formats:
-        1. Nested: player_stats -> stats -> [{stat_id, value}]
-        2. Flat: stats as top-level keys by display name (yahoo_fantasy_api)
+        The client parses every raw response into flat rows keyed by
+        stat_id strings, so only the metadata keys and non-numeric values
+        (e.g. '-' for an undefined percentage) need to be dropped here.
 
         Args:
-            player_data: Player data dict from the API
+            player_data: Player row from ``get_players_stats_all``
 
         Returns:
             dict: {stat_id: float_value}
         """
-        stats = {}
-        player_stats = player_data.get('player_stats', {})
-        if isinstance(player_stats, dict):
-            stat_list = player_stats.get('stats', [])
-        elif isinstance(player_stats, list):
-            stat_list = player_stats
-        else:
-            stat_list = []
-
-        if not stat_list:
-            stat_list = player_data.get('stats', [])
-
-        for stat in stat_list:
-            if isinstance(stat, dict):
-                stat_id = str(stat.get('stat_id', ''))
-                value = stat.get('value', '-')
-                if value != '-' and value is not None:
-                    try:
-                        stats[stat_id] = float(value)
-                    except (ValueError, TypeError):
-                        pass
-
-        # Handle flat format from yahoo_fantasy_api library
-        if not stats and self.reverse_stat_map:
-            for key, value in player_data.items():
-                if key in self.reverse_stat_map and isinstance(value, (int, float)):
-                    stats[self.reverse_stat_map[key]] = value
-
-        return stats
+        return {
+            sid: value for sid, value in player_data.items()
+            if sid not in PLAYER_STATS_META_KEYS
+            and isinstance(value, (int, float))
+        }
 
-    def get_team_player_keys(self, team_key):
-        """Get all player keys for a given team."""
-        roster = self.rosters.get(team_key, [])
-        keys = []
-        for p in roster:
-            pkey = self._get_player_key(p)
-            if pkey:
-                keys.append(pkey)
-        return keys
+    def _roster_player_keys(self, team_key):
+        """
+        All and active player keys for a team, parsed once per roster.
 
-    def get_active_player_keys(self, team_key):
-        """Get player keys for active (non-IL) players on a team.
+        The cached lists are reused for as long as ``self.rosters[team_key]``
+        is the same list object (fetch_rosters() and load_cache() always
+        assign new ones), so callers must not modify them.
 
-        Excludes players whose ``selected_position`` is IL, IL+, or DL.
-        These players should not be counted for future stat projections.
+        Args:
+            team_key: Yahoo team key
+
+        Returns:
+            tuple: (player_keys, active_player_keys)
         """
         roster = self.rosters.get(team_key, [])
+        cached = self._roster_keys.get(team_key)
+        if cached is not None and cached[0] is roster:
+            return cached[1], cached[2]
+
         keys = []
+        active = []
         for p in roster:
             pkey = self._get_player_key(p)
             if not pkey:
                 continue
+            keys.append(pkey)
             pos = p.get('selected_position', '')
             if isinstance(pos, dict):
                 pos = pos.get('position', '')
             pos = str(pos).upper()
-            if pos in ('IL', 'IL+', 'DL'):
-                continue
-            keys.append(pkey)
-        return keys
+            if pos not in ('IL', 'IL+', 'DL'):
+                active.append(pkey)
+        self._roster_keys[team_key] = (roster, keys, active)
+        return keys, active
+
+    def get_team_player_keys(self, team_key):
+        """Get all player keys for a given team (read-only list)."""
+        return self._roster_player_keys(team_key)[0]
+
+    def get_active_player_keys(self, team_key):
+        """Get player keys for active (non-IL) players on a team.
+
+        Excludes players whose ``selected_position`` is IL, IL+, or DL.
+        These players should not be counted for future stat projections.
+        The returned list is cached and must not be modified.
+        """
+        return self._roster_player_keys(team_key)[1]
 
     def get_stat_name(self, stat_id):
         """Get display name for a stat_id."""
-        return self.stat_id_map.get(str(stat_id),
-                                    DEFAULT_ROTO_STATS.get(str(stat_id),
-                                                           f'Stat {stat_id}'))
+        sid = str(stat_id)
+        name = self._stat_names.get(sid)
+        if name is None:
+            name = self.stat_id_map.get(sid, DEFAULT_ROTO_STATS.get(
+                sid, f'Stat {stat_id}'))
+        return name
 
     def is_negative_stat(self, stat_id):
         """Check if a stat is negative (lower is better, e.g., turnovers)."""
@@ -12,12 +12,14 @@ This is the main orchestrator that:
 Usage:
     python roto_analyzer.py
     python roto_analyzer.py --team-key 428.l.21454.t.1
+    python roto_analyzer.py --refresh
 """
 import argparse
 import sys
 
 import pandas as pd
 
+from cache import add_refresh_argument
 from league_data import LeagueData
 from roto_calculator import RotoCalculator
 from trade_simulator import TradeSimulator
@@ -55,28 +57,24 @@ def select_my_team(league_data):
 def print_standings(calculator):
     """Print the current Roto standings table."""
     table = calculator.get_roto_standings_table()
-
-    print(f"\n{'='*90}")
-    print("  ROTISSERIE STANDINGS")
-    print(f"{'='*90}")
-
-    # Header
-    header = f"  {'Rank':<5} {'Team':<25} {'Roto':>6}"
-    for stat_id in calculator.ld.roto_stat_ids:
-        name = calculator.ld.get_stat_name(stat_id)
-        header += f" {name:>6}"
-    print(header)
-    print(f"  {'─'*5} {'─'*25} {'─'*6}", end="")
-    for _ in calculator.ld.roto_stat_ids:
-        print(f" {'─'*6}", end="")
-    print()
-
-    for rank, entry in enumerate(table, 1):
-        row = f"  {rank:<5} {entry['team_name']:<25} {entry['roto_score']:>6.1f}"
-        for stat_id in calculator.ld.roto_stat_ids:
-            pts = entry['category_points'].get(stat_id, 0)
-            row += f" {pts:>6.1f}"
-        print(row)
+    stat_names = [calculator.ld.get_stat_name(sid) for sid in table.columns[2:]]
+
+    lines = [
+        f"\n{'='*90}",
+        "  ROTISSERIE STANDINGS",
+        f"{'='*90}",
+        # Header
+        f"  {'Rank':<5} {'Team':<25} {'Roto':>6} "
+        + " ".join(f"{name:>6}" for name in stat_names),
+        f"  {'─'*5} {'─'*25} {'─'*6} " + " ".join(['─' * 6] * len(stat_names)),
+    ]
+
+    for rank, (_, team_name, roto_score, *points) in enumerate(
+            table.itertuples(name=None), 1):
+        lines.append(
+            f"  {rank:<5} {team_name:<25} {roto_score:>6.1f} "
+            + " ".join(f"{pts:>6.1f}" for pts in points))
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def print_safety_margins(calculator, team_key):
@@ -84,17 +82,25 @@ def print_safety_margins(calculator, team_key):
     margins = calculator.get_safety_margins(team_key)
     team_name = calculator.ld.teams.get(team_key, team_key)
 
-    print(f"\n{'='*90}")
-    print(f"  STANDINGS GAPS & SAFETY MARGINS - {team_name}")
-    print(f"{'='*90}")
-    print(f"  {'Category':<12} {'Rank':>5} {'Pts':>6} {'To Gain Rank':>14} {'Safety Margin':>14}")
-    print(f"  {'─'*12} {'─'*5} {'─'*6} {'─'*14} {'─'*14}")
+    lines = [
+        f"\n{'='*90}",
+        f"  STANDINGS GAPS & SAFETY MARGINS - {team_name}",
+        f"{'='*90}",
+        f"  {'Category':<12} {'Rank':>5} {'Pts':>6} {'To Gain Rank':>14} {'Safety Margin':>14}",
+        f"  {'─'*12} {'─'*5} {'─'*6} {'─'*14} {'─'*14}",
+    ]
 
     for m in margins:
         gain_str = f"{m['opportunity']:.1f}" if m['opportunity'] is not None else "Already #1"
         safety_str = f"{m['safety_margin']:.1f}" if m['safety_margin'] is not None else "Already Last"
-        print(f"  {m['stat_name']:<12} {m['current_rank']:>5} {m['rank_points']:>6.1f}"
-              f" {gain_str:>14} {safety_str:>14}")
+        lines.append(f"  {m['stat_name']:<12} {m['current_rank']:>5} {m['rank_points']:>6.1f}"
+                     f" {gain_str:>14} {safety_str:>14}")
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def _format_delta(delta):
+    """Format a Roto score change, with a '+' sign only when positive."""
+    return f"+{delta:.1f}" if delta > 0 else f"{delta:.1f}"
 
 
 def print_trade_suggestions(trades, league_data):
@@ -103,43 +109,42 @@ def print_trade_suggestions(trades, league_data):
         print("\n  No beneficial trades found.")
         return
 
-    print(f"\n{'='*90}")
-    print("  TOP TRADE SUGGESTIONS")
-    print(f"{'='*90}")
-
-    # Build DataFrame
-    rows = []
-    for i, trade in enumerate(trades, 1):
-        my_give = ', '.join(trade['my_players_traded'])
-        my_get = ', '.join(trade['their_players_traded'])
-
-        rows.append({
-            'Rank': i,
-            'You Give': my_give,
-            'You Get': my_get,
-            'Opponent': trade.get('opponent_team', ''),
-            'Your Δ Roto': f"+{trade['my_delta']:.1f}" if trade['my_delta'] > 0 else f"{trade['my_delta']:.1f}",
-            'Their Δ Roto': f"+{trade['their_delta']:.1f}" if trade['their_delta'] > 0 else f"{trade['their_delta']:.1f}",
-            'Mutual': '✓' if trade.get('mutually_beneficial') else '✗',
-        })
-
-    df = pd.DataFrame(rows)
-    print()
-    print(df.to_string(index=False))
+    lines = [
+        f"\n{'='*90}",
+        "  TOP TRADE SUGGESTIONS",
+        f"{'='*90}",
+    ]
+
+    # Build the DataFrame column-wise; no per-row dicts to re-scan
+    df = pd.DataFrame({
+        'Rank': range(1, len(trades) + 1),
+        'You Give': [', '.join(t['my_players_traded']) for t in trades],
+        'You Get': [', '.join(t['their_players_traded']) for t in trades],
+        'Opponent': [t.get('opponent_team', '') for t in trades],
+        'Your Δ Roto': [_format_delta(t['my_delta']) for t in trades],
+        'Their Δ Roto': [_format_delta(t['their_delta']) for t in trades],
+        'Mutual': ['✓' if t.get('mutually_beneficial') else '✗'
+                   for t in trades],
+    })
+    lines.append("")
+    lines.append(df.to_string(index=False))
 
     # Also print detailed view
-    print(f"\n{'─'*90}")
+    lines.append(f"\n{'─'*90}")
     for i, trade in enumerate(trades, 1):
         mutual = "YES ✓" if trade.get('mutually_beneficial') else "NO"
-        print(f"\n  Trade #{i}:")
-        print(f"    You give:  {', '.join(trade['my_players_traded'])}")
-        print(f"    You get:   {', '.join(trade['their_players_traded'])}")
-        print(f"    From:      {trade.get('opponent_team', '')}")
-        print(f"    Your Roto: {trade['my_old_score']:.1f} → {trade['my_new_score']:.1f}"
-              f" (Δ {trade['my_delta']:+.1f})")
-        print(f"    Their Roto: {trade['their_old_score']:.1f} → {trade['their_new_score']:.1f}"
-              f" (Δ {trade['their_delta']:+.1f})")
-        print(f"    Mutually beneficial: {mutual}")
+        lines.extend([
+            f"\n  Trade #{i}:",
+            f"    You give:  {', '.join(trade['my_players_traded'])}",
+            f"    You get:   {', '.join(trade['their_players_traded'])}",
+            f"    From:      {trade.get('opponent_team', '')}",
+            f"    Your Roto: {trade['my_old_score']:.1f} → {trade['my_new_score']:.1f}"
+            f" (Δ {trade['my_delta']:+.1f})",
+            f"    Their Roto: {trade['their_old_score']:.1f} → {trade['their_new_score']:.1f}"
+            f" (Δ {trade['their_delta']:+.1f})",
+            f"    Mutually beneficial: {mutual}",
+        ])
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def main():
@@ -160,6 +165,7 @@ def main():
         type=int, default=5,
         help='Number of top trade suggestions to show (default: 5)'
     )
+    add_refresh_argument(parser)
     args = parser.parse_args()
 
     try:
@@ -171,19 +177,12 @@ def main():
         print("\n  Connecting to Yahoo Fantasy Basketball API...")
         ld = LeagueData()
 
-        print("  Fetching league settings...")
-        ld.fetch_settings()
-
-        print("  Fetching standings...")
-        ld.fetch_standings()
-
-        print(f"  Found {len(ld.teams)} teams in league {ld.client.league_id}")
-
-        print("  Fetching rosters for all teams...")
-        ld.fetch_rosters()
-
-        print("  Fetching player season stats...")
-        ld.fetch_player_stats()
+        print("  Loading league settings, standings, rosters and player stats...")
+        if ld.fetch_all(refresh=args.refresh):
+            print(f"  Loaded cached data for league {ld.client.league_id} "
+                  f"(use --refresh to re-fetch)")
+        else:
+            print(f"  Found {len(ld.teams)} teams in league {ld.client.league_id}")
 
         total_players = sum(len(r) for r in ld.rosters.values())
         print(f"  Loaded stats for {len(ld.player_stats)} of {total_players} players")
@@ -10,7 +10,65 @@ all categories. Higher total = better standing.
 
 Reference: https://help.yahoo.com/kb/rotisserie-scoring-sln6187.html
 """
-from copy import deepcopy
+from bisect import bisect_left, bisect_right
+from itertools import groupby
+from operator import itemgetter
+
+import pandas as pd
+
+_by_value = itemgetter(1)
+
+
+def _assign_rank_points(sorted_vals, num_teams):
+    """
+    Rank points for values already sorted best-first.
+
+    The best value earns num_teams points, the next num_teams - 1, and
+    so on.  Tied values share the average of the points they span.
+
+    Args:
+        sorted_vals: Stat values ordered best to worst
+        num_teams: Number of teams in the league
+
+    Returns:
+        list: Rank points aligned with sorted_vals
+    """
+    points = []
+    i = 0
+    for _, group in groupby(sorted_vals):
+        size = sum(1 for _ in group)
+        j = i + size
+        # Positions i through j-1 earn (num_teams - i) down to
+        # (num_teams - j + 1); their mean is the midpoint
+        points.extend([num_teams - (i + j - 1) / 2] * size)
+        i = j
+    return points
+
+
+def _moved_points(others, val, other_val, n, num_teams):
+    """
+    Tie-averaged rank points for a modified team's sign-adjusted value.
+
+    Args:
+        others: Ascending sign-adjusted values of the unmodified teams
+        val: The team's new sign-adjusted value
+        other_val: The other modified team's new value, or None
+        n: Number of teams with a value in this category
+        num_teams: Number of teams in the league
+
+    Returns:
+        float: Same points calculate_standings() would assign
+    """
+    below = bisect_left(others, val)
+    tied = bisect_right(others, val) - below + 1
+    if other_val is not None:
+        if other_val < val:
+            below += 1
+        elif other_val == val:
+            tied += 1
+    i = n - below - tied
+    j = n - below
+    return num_teams - (i + j - 1) / 2
 
 
 class RotoCalculator:
@@ -24,6 +82,51 @@ class RotoCalculator:
     def __init__(self, league_data):
         self.ld = league_data
         self.num_teams = len(self.ld.teams)
+        # Roto category metadata, resolved once instead of per call
+        self._stat_ids = tuple(self.ld.roto_stat_ids)
+        self._is_neg = tuple(self.ld.is_negative_stat(sid)
+                             for sid in self._stat_ids)
+        self._stat_names = {sid: self.ld.get_stat_name(sid)
+                            for sid in self._stat_ids}
+        # (stat_id, sort_descending) for each Roto category.  Internal
+        # per-stat tables are tuples in this order, indexed by position;
+        # public results stay keyed by stat_id.
+        self._stat_order = tuple(
+            (sid, not neg) for sid, neg in zip(self._stat_ids, self._is_neg))
+        # Baseline standings and the team_stats dict they were built from
+        self._baseline = None
+        self._baseline_source = None
+        # Baseline values per stat position, ascending, sign-adjusted so that
+        # higher is always better (used by rank_delta)
+        self._sorted_vals = ()
+        # Baseline per team: stat values (None if missing) and rank points
+        # as tuples by stat position
+        self._rows = {}
+        self._row_points = {}
+        # Per team pair: _sorted_vals without that pair's values
+        self._pair_cols = {}
+        # Per team: get_standings_gaps() result against the baseline
+        self._gaps = {}
+
+    def invalidate_cache(self):
+        """
+        Discard the cached baseline standings.
+
+        Needed only after ``ld.team_stats`` is modified in place; a new
+        dict (e.g. from ``LeagueData.fetch_standings()``) is detected
+        automatically.
+        """
+        self._baseline = None
+        self._baseline_source = None
+        self._sorted_vals = ()
+        self._rows = {}
+        self._row_points = {}
+        self._pair_cols = {}
+        self._gaps = {}
+
+    def _as_row(self, stats):
+        """Stat values of one team as a tuple by stat position."""
+        return tuple(stats.get(sid) for sid in self._stat_ids)
 
     def calculate_standings(self, team_stats=None):
         """
@@ -33,6 +136,10 @@ class RotoCalculator:
         (where N = number of teams), second-best gets N-1, etc.
         For negative stats (like TO), lower values get higher ranks.
 
+        The baseline result (``team_stats`` None or ``self.ld.team_stats``)
+        is computed once and shared between calls, so callers must not
+        modify it.
+
         Args:
             team_stats: Optional dict of {team_key: {stat_id: value}}.
                         If None, uses self.ld.team_stats.
@@ -42,72 +149,293 @@ class RotoCalculator:
                 'rankings': {stat_id: [(team_key, value, rank_points), ...]},
                 'roto_scores': {team_key: total_roto_score},
                 'category_points': {team_key: {stat_id: rank_points}},
+                'team_positions': {stat_id: {team_key: index_in_rankings}},
             }
         """
         if team_stats is None:
             team_stats = self.ld.team_stats
+        is_baseline = team_stats is self.ld.team_stats
+        if is_baseline and self._baseline_source is team_stats:
+            return self._baseline
 
         num_teams = len(team_stats)
         rankings = {}
+        team_positions = {}
         category_points = {tk: {} for tk in team_stats}
+        roto_scores = dict.fromkeys(team_stats, 0)
 
-        for stat_id in self.ld.roto_stat_ids:
+        for stat_id, reverse in self._stat_order:
             # Gather (team_key, value) for teams that have this stat
-            teams_values = []
-            for tk, stats in team_stats.items():
-                val = stats.get(stat_id)
-                if val is not None:
-                    teams_values.append((tk, val))
+            teams_values = [(tk, stats[stat_id])
+                            for tk, stats in team_stats.items()
+                            if stats.get(stat_id) is not None]
 
             if not teams_values:
                 continue
 
             # Sort: for negative stats (TO), lower is better -> ascending
             # For positive stats, higher is better -> descending
-            reverse = not self.ld.is_negative_stat(stat_id)
-            teams_values.sort(key=lambda x: x[1], reverse=reverse)
+            teams_values.sort(key=_by_value, reverse=reverse)
 
             # Assign rank points: best team gets num_teams, worst gets 1
-            # Handle ties by averaging rank points
+            points = _assign_rank_points(
+                [val for _, val in teams_values], num_teams)
+
+            # One pass fills the ranking, positions, per-category points
+            # and running Roto totals
             ranked = []
-            i = 0
-            while i < len(teams_values):
-                # Find all teams tied at this value
-                j = i + 1
-                while j < len(teams_values) and teams_values[j][1] == teams_values[i][1]:
-                    j += 1
-
-                # Average the rank points for tied teams
-                # Positions i through j-1 correspond to rank points
-                # (num_teams - i) down to (num_teams - j + 1)
-                avg_points = sum(num_teams - k for k in range(i, j)) / (j - i)
-
-                for k in range(i, j):
-                    tk = teams_values[k][0]
-                    val = teams_values[k][1]
-                    ranked.append((tk, val, avg_points))
-                    category_points[tk][stat_id] = avg_points
-
-                i = j
+            positions = {}
+            for idx, ((tk, val), pts) in enumerate(zip(teams_values, points)):
+                ranked.append((tk, val, pts))
+                positions[tk] = idx
+                category_points[tk][stat_id] = pts
+                roto_scores[tk] += pts
 
             rankings[stat_id] = ranked
+            team_positions[stat_id] = positions
 
-        # Calculate total Roto scores
-        roto_scores = {}
-        for tk in team_stats:
-            roto_scores[tk] = sum(category_points.get(tk, {}).values())
-
-        return {
+        result = {
             'rankings': rankings,
             'roto_scores': roto_scores,
             'category_points': category_points,
+            'team_positions': team_positions,
         }
+        if is_baseline:
+            self._baseline = result
+            self._baseline_source = team_stats
+            self._sorted_vals = tuple(
+                [v if higher_better else -v
+                 for _, v, _ in reversed(rankings.get(sid, ()))]
+                for sid, higher_better in self._stat_order
+            )
+            self._rows = {tk: self._as_row(stats)
+                          for tk, stats in team_stats.items()}
+            self._row_points = {
+                tk: tuple(points.get(sid, 0) for sid in self._stat_ids)
+                for tk, points in category_points.items()
+            }
+            self._pair_cols = {}
+            self._gaps = {}
+        return result
+
+    @staticmethod
+    def what_if(base, overrides):
+        """
+        Build a modified copy of team_stats without deep-copying it.
+
+        Only the rows named in ``overrides`` are copied (and updated), so
+        they may be modified freely; every other row is shared with
+        ``base`` and must be treated as read-only.
+
+        Args:
+            base: {team_key: {stat_id: value}} to start from
+            overrides: {team_key: {stat_id: new_value}}; an empty dict
+                       copies the row unchanged
+
+        Returns:
+            dict: {team_key: {stat_id: value}}
+        """
+        out = dict(base)
+        for tk, changes in overrides.items():
+            out[tk] = {**base.get(tk, {}), **changes}
+        return out
+
+    def rank_delta(self, team_a, team_b, new_stats):
+        """
+        Change in Roto score for two teams whose stats changed.
+
+        Equivalent to re-running calculate_standings() with only these
+        two teams modified, but each category costs a couple of binary
+        searches into the cached baseline order instead of a full sort.
+        The other teams' values are unchanged, so only the two teams'
+        own positions need locating, and categories where neither team's
+        value changed keep their baseline points without a search.
+
+        Args:
+            team_a: First team key
+            team_b: Second team key
+            new_stats: {team_key: {stat_id: value}} with the new totals
+                       for team_a and team_b
+
+        Returns:
+            dict: {team_a: delta, team_b: delta}
+        """
+        self.calculate_standings()
+        num_teams = len(self.ld.team_stats)
+        width = len(self._stat_ids)
+        empty = (None,) * width
+        old_a = self._rows.get(team_a, empty)
+        old_b = self._rows.get(team_b, empty)
+        new_a = self._as_row(new_stats.get(team_a, {}))
+        new_b = self._as_row(new_stats.get(team_b, {}))
+        no_points = (0,) * width
+        points_a = self._row_points.get(team_a, no_points)
+        points_b = self._row_points.get(team_b, no_points)
+        delta_a = delta_b = 0
+
+        per_stat = zip(self._pair_columns((team_a, team_b)),
+                       old_a, old_b, new_a, new_b, points_a, points_b)
+        for column, a_before, b_before, a_after, b_after, a_points, b_points \
+                in per_stat:
+            # Neither team's value moved: both keep their baseline points
+            if a_after == a_before and b_after == b_before:
+                continue
+
+            delta_a -= a_points
+            delta_b -= b_points
+            _, higher_better, others = column
+            if not higher_better:
+                a_after = None if a_after is None else -a_after
+                b_after = None if b_after is None else -b_after
+            n = len(others) + (a_after is not None) + (b_after is not None)
+            if a_after is not None:
+                delta_a += _moved_points(others, a_after, b_after, n, num_teams)
+            if b_after is not None:
+                delta_b += _moved_points(others, b_after, a_after, n, num_teams)
+
+        return {team_a: delta_a, team_b: delta_b}
+
+    def could_change_ranks(self, new_stats):
+        """
+        Cheap check for whether new stats might move any Roto rank.
+
+        A team whose new value in a category stays strictly between its
+        baseline neighbours' values keeps its rank points there, so when
+        that holds for every team and category the Roto scores are
+        unchanged and rank_delta() can be skipped.  The check is
+        conservative: it answers True whenever it cannot rule a change
+        out (e.g. two of the modified teams are neighbours, or the team
+        was tied at baseline, since leaving a tie changes the averaged
+        points of every team in it).
+
+        Args:
+            new_stats: {team_key: {stat_id: value}} for the modified teams
+
+        Returns:
+            bool: False only if every Roto score is certainly unchanged
+        """
+        result = self.calculate_standings()
+        rankings = result['rankings']
+        positions = result['team_positions']
+
+        for stat_id, higher_better in self._stat_order:
+            ranked = rankings.get(stat_id, ())
+            column_positions = positions.get(stat_id, {})
+            last = len(ranked) - 1
+            for tk, stats in new_stats.items():
+                val = stats.get(stat_id)
+                idx = column_positions.get(tk)
+                if val is None or idx is None:
+                    if val is not None or idx is not None:
+                        return True
+                    continue
+                old_val = ranked[idx][1]
+                if val == old_val:
+                    continue
+                # Moving out of a baseline tie re-splits the tied points
+                if (idx > 0 and ranked[idx - 1][1] == old_val) or (
+                        idx < last and ranked[idx + 1][1] == old_val):
+                    return True
+                if not higher_better:
+                    val = -val
+                if idx > 0:
+                    above_tk, above_val, _ = ranked[idx - 1]
+                    if above_tk in new_stats or val >= (
+                            above_val if higher_better else -above_val):
+                        return True
+                if idx < last:
+                    below_tk, below_val, _ = ranked[idx + 1]
+                    if below_tk in new_stats or val <= (
+                            below_val if higher_better else -below_val):
+                        return True
+        return False
+
+    def could_gain(self, team_key, rival_key, new_stats):
+        """
+        Cheap check for whether a two-team change might raise a team's score.
+
+        With every other team unchanged, a team can only earn more points
+        in a category if its own value improves or the other modified
+        team's value gets worse.  When neither happens in any category the
+        team's score cannot rise, so rank_delta() can be skipped.
+
+        Args:
+            team_key: Team whose gain is in question
+            rival_key: The other modified team
+            new_stats: {team_key: {stat_id: value}} for the two teams
+
+        Returns:
+            bool: False only if the team's Roto score certainly does not rise
+        """
+        self.calculate_standings()
+        empty = (None,) * len(self._stat_ids)
+        old_mine = self._rows.get(team_key, empty)
+        old_rival = self._rows.get(rival_key, empty)
+        new_mine = (self._as_row(new_stats[team_key])
+                    if team_key in new_stats else old_mine)
+        new_rival = (self._as_row(new_stats[rival_key])
+                     if rival_key in new_stats else old_rival)
+
+        per_stat = zip(self._stat_order, old_mine, new_mine,
+                       old_rival, new_rival)
+        for (_, higher_better), mine_before, mine_after, rival_before, \
+                rival_after in per_stat:
+            if ((mine_before is None) != (mine_after is None)
+                    or (rival_before is None) != (rival_after is None)):
+                return True
+            if mine_before is None:
+                continue
+            if higher_better:
+                if mine_after > mine_before or (
+                        rival_before is not None and rival_after < rival_before):
+                    return True
+            elif mine_after < mine_before or (
+                    rival_before is not None and rival_after > rival_before):
+                return True
+        return False
+
+    def _pair_columns(self, pair):
+        """
+        Baseline stat columns with a pair of teams' values removed.
+
+        find_best_trades evaluates many player swaps between the same two
+        teams, so the columns are built once per pair and reused.
+
+        Args:
+            pair: (team_a, team_b) tuple
+
+        Returns:
+            tuple: (stat_id, higher_better, sorted_other_values) per stat
+        """
+        columns = self._pair_cols.get(pair)
+        if columns is not None:
+            return columns
+
+        empty = (None,) * len(self._stat_ids)
+        pair_rows = [self._rows.get(tk, empty) for tk in pair]
+        columns = []
+        for k, ((stat_id, higher_better), column) in enumerate(
+                zip(self._stat_order, self._sorted_vals)):
+            others = list(column)
+            for row in pair_rows:
+                val = row[k]
+                if val is not None:
+                    del others[bisect_left(others, val if higher_better
+                                           else -val)]
+            columns.append((stat_id, higher_better, others))
+        columns = tuple(columns)
+        self._pair_cols[pair] = columns
+        return columns
 
     def get_standings_gaps(self, team_key):
         """
         Identify how much a team needs to gain/lose in each category to
         move up or down one rank.
 
+        The per-category walk is done once per team against the cached
+        baseline and reused (e.g. by get_safety_margins), so callers must
+        not modify the result.
+
         Returns:
             dict: {
                 stat_id: {
@@ -122,27 +450,25 @@ class RotoCalculator:
             }
         """
         result = self.calculate_standings()
+        gaps = self._gaps.get(team_key)
+        if gaps is not None:
+            return gaps
+
         rankings = result['rankings']
+        positions = result['team_positions']
         gaps = {}
 
-        for stat_id in self.ld.roto_stat_ids:
+        for stat_id, is_negative in zip(self._stat_ids, self._is_neg):
             ranked = rankings.get(stat_id, [])
             if not ranked:
                 continue
 
-            # Find current team position
-            team_idx = None
-            for idx, (tk, val, pts) in enumerate(ranked):
-                if tk == team_key:
-                    team_idx = idx
-                    break
-
+            team_idx = positions[stat_id].get(team_key)
             if team_idx is None:
                 continue
 
             current_val = ranked[team_idx][1]
             rank_points = ranked[team_idx][2]
-            is_negative = self.ld.is_negative_stat(stat_id)
 
             # To gain rank: look at team_idx - 1 (the one ranked above)
             to_gain = None
@@ -178,6 +504,7 @@ class RotoCalculator:
                 'rank_points': rank_points,
             }
 
+        self._gaps[team_key] = gaps
         return gaps
 
     def get_safety_margins(self, team_key):
@@ -203,7 +530,7 @@ class RotoCalculator:
         for stat_id, gap in gaps.items():
             margins.append({
                 'stat_id': stat_id,
-                'stat_name': self.ld.get_stat_name(stat_id),
+                'stat_name': self._stat_names[stat_id],
                 'current_rank': gap['current_rank'],
                 'safety_margin': gap['to_lose_rank'],
                 'opportunity': gap['to_gain_rank'],
@@ -221,24 +548,25 @@ class RotoCalculator:
         per-category rank points.
 
         Returns:
-            list of dicts sorted by total Roto score (descending):
-            [{
-                'team_key': str,
-                'team_name': str,
-                'roto_score': float,
-                'category_points': {stat_id: float},
-            }]
+            pandas.DataFrame indexed by team_key, with columns
+            ['team_name', 'roto_score', *stat_ids], sorted by roto_score
+            (descending).  A category a team has no value in counts as
+            0 points.
         """
         result = self.calculate_standings()
-        table = []
+        roto_scores = result['roto_scores']
+        category_points = result['category_points']
+        stat_ids = self._stat_ids
 
+        rows = []
         for tk in self.ld.teams:
-            table.append({
-                'team_key': tk,
-                'team_name': self.ld.teams[tk],
-                'roto_score': result['roto_scores'].get(tk, 0),
-                'category_points': result['category_points'].get(tk, {}),
-            })
-
-        table.sort(key=lambda x: x['roto_score'], reverse=True)
-        return table
+            points = category_points.get(tk, {})
+            rows.append([roto_scores.get(tk, 0)]
+                        + [points.get(sid, 0) for sid in stat_ids])
+
+        index = pd.Index(list(self.ld.teams), name='team_key')
+        table = pd.DataFrame(rows, index=index,
+                             columns=['roto_score', *stat_ids], dtype=float)
+        table.insert(0, 'team_name', list(self.ld.teams.values()))
+        # Stable, so tied teams keep league order
+        return table.sort_values('roto_score', ascending=False, kind='stable')
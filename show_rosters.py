@@ -7,9 +7,15 @@ formatted for Rotisserie (Roto) league analysis.
 
 Usage:
     python show_rosters.py
+    python show_rosters.py --refresh
 """
+import argparse
 import sys
-from client import FantasyBasketballClient
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from cache import add_refresh_argument
+from client import FantasyBasketballClient, MAX_WORKERS, stat_key
 
 
 # Standard Roto stat categories with display names
@@ -34,6 +40,15 @@ COMPONENT_STAT_NAMES = {
     '7': 'FTA',
 }
 
+# Percentage stats (FG%, FT%)
+PCT_STAT_IDS = frozenset({'5', '8'})
+
+# Percentage stat_id -> (made, attempted) component stat_ids
+PCT_COMPONENTS = {
+    '5': ('3', '4'),   # FGM / FGA
+    '8': ('6', '7'),   # FTM / FTA
+}
+
 # Games played stat
 GP_STAT_ID = '0'
 
@@ -41,87 +56,470 @@ GP_STAT_ID = '0'
 NBA_TOTAL_GAMES = 82
 
 
-def build_stat_id_map(stat_categories):
+def parse_stat_categories(stat_categories):
     """
-    Build a mapping of stat_id to display_name from raw API stat categories.
+    Derive every stat lookup used by the report in one pass.
+
+    The reverse (display_name -> stat_id) map prefers the API's names,
+    then falls back to the hardcoded Roto, component and GP names for
+    any that are missing.
 
     Args:
         stat_categories: List of stat category dicts from raw API settings
 
     Returns:
-        dict: Mapping of stat_id (str) to display_name (str)
+        tuple: (stat_id_map, reverse_stat_map, roto_stat_ids) where
+               roto_stat_ids lists the non-display-only stat_ids,
+               falling back to ROTO_STAT_NAMES if there are none
     """
-    stat_map = {}
+    stat_id_map = {}
+    reverse_map = {}
+    roto_stat_ids = []
     for cat in stat_categories:
-        stat_id = str(cat.get('stat_id', ''))
+        stat_id = stat_key(cat.get('stat_id', ''))
         display_name = cat.get('display_name', f'Stat {stat_id}')
-        stat_map[stat_id] = display_name
-    return stat_map
+        stat_id_map[stat_id] = display_name
+        reverse_map[display_name] = stat_id
+        if stat_id and str(cat.get('is_only_display_stat', '0')) != '1':
+            roto_stat_ids.append(stat_id)
+
+    for defaults in (ROTO_STAT_NAMES, COMPONENT_STAT_NAMES):
+        for sid, dname in defaults.items():
+            reverse_map.setdefault(dname, sid)
+    reverse_map.setdefault('GP', GP_STAT_ID)
+    if not roto_stat_ids:
+        roto_stat_ids = list(ROTO_STAT_NAMES)
+    return stat_id_map, reverse_map, roto_stat_ids
 
 
-def build_reverse_stat_map(stat_id_map):
+def collect_roster_players(roster):
     """
-    Build a reverse mapping: display_name -> stat_id.
+    Collect player keys and display info from a team roster.
 
-    Uses the API-provided stat_id_map first, then falls back to
-    hardcoded defaults for any missing entries.
+    Args:
+        roster: List of player dicts from ``get_team_roster``
+
+    Returns:
+        tuple: (player_keys list, {player_key: {name, position, team}})
+    """
+    player_keys = []
+    player_info = {}
+    for player in roster:
+        pkey = player.get('player_key', '')
+        if not pkey:
+            pkey = player.get('player_id', '')
+        pname = player.get('name', 'Unknown')
+        if isinstance(pname, dict):
+            pname = pname.get('full', 'Unknown')
+        position = player.get('selected_position', {})
+        if isinstance(position, dict):
+            position = position.get('position', 'N/A')
+        else:
+            position = str(position) if position else 'N/A'
+        editorial_team = player.get('editorial_team_abbr', '')
+
+        if pkey:
+            player_keys.append(pkey)
+            player_info[pkey] = {
+                'name': pname,
+                'position': position,
+                'team': editorial_team,
+            }
+    return player_keys, player_info
+
+
+def fetch_rosters(client, team_keys):
+    """
+    Fetch every team's roster, in one request where possible.
+
+    Uses a single ``get_all_rosters`` call for the whole league.  If that
+    fails, each roster is requested separately (concurrently, since the
+    requests are I/O-bound).
 
     Args:
-        stat_id_map: dict mapping stat_id -> display_name from API
+        client: FantasyBasketballClient
+        team_keys: List of Yahoo team keys
 
     Returns:
-        dict: Mapping of display_name (str) to stat_id (str)
+        tuple: ({team_key: roster}, {team_key: error}) for the teams that
+               were and were not fetched
     """
-    reverse_map = {}
-    for sid, dname in stat_id_map.items():
-        reverse_map[dname] = sid
-    for sid, dname in ROTO_STAT_NAMES.items():
-        if dname not in reverse_map:
-            reverse_map[dname] = sid
-    for sid, dname in COMPONENT_STAT_NAMES.items():
-        if dname not in reverse_map:
-            reverse_map[dname] = sid
-    if 'GP' not in reverse_map:
-        reverse_map['GP'] = GP_STAT_ID
-    return reverse_map
+    rosters = {}
+    roster_errors = {}
+    try:
+        fetched = client.get_all_rosters(team_keys)
+    except Exception as e:
+        print(f"  ⚠ Batched roster fetch failed ({e}); fetching per team")
+    else:
+        for team_key in team_keys:
+            if team_key in fetched:
+                rosters[team_key] = fetched[team_key]
+            else:
+                roster_errors[team_key] = 'no roster returned'
+        return rosters, roster_errors
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        futures = {team_key: pool.submit(client.get_team_roster, team_key)
+                   for team_key in team_keys}
+        for team_key, future in futures.items():
+            try:
+                rosters[team_key] = future.result()
+            except Exception as e:
+                roster_errors[team_key] = e
+    return rosters, roster_errors
 
 
-def format_stat_value(stat_id, value):
-    """Format a stat value for display based on its type."""
-    if stat_id in ('5', '8'):  # FG%, FT% are percentages
-        if isinstance(value, (int, float)):
-            return f"{value:.3f}"
-    if isinstance(value, float) and value == int(value):
-        return str(int(value))
+def _as_float(value):
+    """
+    Coerce a stat value to float.
+
+    Args:
+        value: Stat value from a player stats row
+
+    Returns:
+        float or None: None for missing or undefined ('-', '') values
+    """
+    if value is None or value == '-' or value == '':
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _make_converter(pairs):
+    """
+    Build a converter from one flat player stat dict to stat_id keys.
+
+    The (source_key, stat_id) pairs are fixed for the run, so they are
+    resolved into a tuple once and bound to the returned function along
+    with _as_float, leaving one ``dict.get`` and one coercion per known
+    stat in the per-player loop.
+
+    Args:
+        pairs: Iterable of (key_in_player_dict, stat_id)
+
+    Returns:
+        callable: ``convert(player_dict) -> {stat_id: float}`` keeping
+                  only values that coerce to a number
+    """
+    pairs = tuple(pairs)
+
+    def convert(ps, pairs=pairs, as_float=_as_float):
+        get = ps.get
+        pstats = {}
+        for name, sid in pairs:
+            value = as_float(get(name))
+            if value is not None:
+                pstats[sid] = value
+        return pstats
+
+    return convert
+
+
+def make_stat_converter(reverse_stat_map):
+    """
+    Build a converter for library rows keyed by display name.
+
+    Args:
+        reverse_stat_map: Mapping of display_name -> stat_id
+
+    Returns:
+        callable: ``convert(player_dict) -> {stat_id: float}``
+    """
+    return _make_converter(reverse_stat_map.items())
+
+
+def make_stat_filter(stat_ids):
+    """
+    Build a converter for rows already keyed by stat_id.
+
+    Keeps only the given stats, coerced to floats, as
+    make_stat_converter() does for display-name rows.
+
+    Args:
+        stat_ids: Stat ids to keep
+
+    Returns:
+        callable: ``convert(player_dict) -> {stat_id: float}``
+    """
+    return _make_converter((sid, sid) for sid in stat_ids)
+
+
+def _match_player_stats(stats_response, convert, player_info):
+    """
+    Convert player stat rows and key them by roster player key.
+
+    Args:
+        stats_response: List of flat player stat dicts
+        convert: Row converter from _make_converter()
+        player_info: Roster players keyed by player key; players whose
+                     id is not a key here are matched by name
+
+    Returns:
+        dict: {player_key: {stat_id: value}}
+    """
+    player_season_stats = {}
+    if not isinstance(stats_response, list):
+        return player_season_stats
+
+    # {name: player_key} for the name fallback, built on first use; the
+    # first roster player with a given name wins
+    name_to_key = None
+    for ps in stats_response:
+        pid = ps.get('player_id', '')
+        if not pid:
+            continue
+        pstats = convert(ps)
+        if pid in player_info:
+            player_season_stats[pid] = pstats
+        else:
+            # Try match by name
+            if name_to_key is None:
+                name_to_key = {}
+                for k, v in player_info.items():
+                    name_to_key.setdefault(v['name'], k)
+            k = name_to_key.get(ps.get('name', ''))
+            if k is not None:
+                player_season_stats[k] = pstats
+    return player_season_stats
+
+
+def extract_player_stats(stats_response, reverse_stat_map, player_info):
+    """
+    Convert a ``get_players_stats`` response to stat_id-keyed dicts.
+
+    The library returns one flat dict per player keyed by display name;
+    each is converted by a make_stat_converter() function.
+
+    Args:
+        stats_response: List of flat player stat dicts
+        reverse_stat_map: Mapping of display_name -> stat_id
+        player_info: Roster players keyed by player key; players whose
+                     id is not a key here are matched by name
+
+    Returns:
+        dict: {player_key: {stat_id: value}}
+    """
+    return _match_player_stats(stats_response,
+                               make_stat_converter(reverse_stat_map),
+                               player_info)
+
+
+def select_player_stats(stats_response, stat_ids, player_info):
+    """
+    Filter a ``get_players_stats_all`` response to the known stats.
+
+    Those rows are already keyed by stat_id, so only the wanted stats
+    are kept (as floats) and the players matched to the roster.
+
+    Args:
+        stats_response: List of stat_id-keyed player rows
+        stat_ids: Stat ids to keep
+        player_info: Roster players keyed by player key; players whose
+                     id is not a key here are matched by name
+
+    Returns:
+        dict: {player_key: {stat_id: value}}
+    """
+    return _match_player_stats(stats_response, make_stat_filter(stat_ids),
+                               player_info)
+
+
+def stat_columns(stats_rows, stat_ids):
+    """
+    Transpose per-player stat dicts into one column per stat.
+
+    Args:
+        stats_rows: List of {stat_id: numeric value} dicts, one per player
+        stat_ids: Stat IDs to extract
+
+    Returns:
+        dict: {stat_id: [value or None, ...]} aligned with stats_rows
+    """
+    return {sid: [pstats.get(sid) for pstats in stats_rows]
+            for sid in stat_ids}
+
+
+def sum_stat_columns(columns, stat_ids):
+    """
+    Sum stat columns over a team's players.
+
+    Args:
+        columns: {stat_id: [value or None, ...]} from stat_columns()
+        stat_ids: Stat IDs to total
+
+    Returns:
+        dict: {stat_id: total} for each stat at least one player has
+    """
+    totals = {}
+    for sid in stat_ids:
+        values = [v for v in columns[sid] if v is not None]
+        if values:
+            totals[sid] = sum(values)
+    return totals
+
+
+@lru_cache(maxsize=4096, typed=True)
+def _format_count(value):
+    """
+    Format a counting stat: whole floats as ints, else one decimal.
+
+    Counting stats take few distinct values and repeat across players,
+    so results are memoized.  Percentages are formatted by _format_pct,
+    which is not cached since its values rarely repeat.
+    """
     if isinstance(value, float):
+        if value == int(value):
+            return str(int(value))
         return f"{value:.1f}"
     return str(value)
 
 
+def _format_pct(value):
+    """Format a percentage stat with three decimals."""
+    if isinstance(value, (int, float)):
+        return f"{value:.3f}"
+    return _format_count(value)
+
+
+def stat_formatter(stat_id):
+    """Return the value formatter for a stat_id."""
+    return _format_pct if stat_id in PCT_STAT_IDS else _format_count
+
+
+def format_stat_value(stat_id, value):
+    """Format a stat value for display based on its type."""
+    return stat_formatter(stat_id)(value)
+
+
+def build_table_layout(display_stat_ids, stat_id_map):
+    """
+    Build the per-run pieces of the roster table.
+
+    The row template, header, separator and per-column formatters are the
+    same for every team.  Header, player and totals rows share the
+    template, so each row is a single format() call.
+
+    Args:
+        display_stat_ids: Stat IDs shown as columns, in order
+        stat_id_map: Mapping of stat_id -> display_name
+
+    Returns:
+        dict: Layout consumed by render_team_table()
+    """
+    stat_headers = [
+        stat_id_map.get(sid, ROTO_STAT_NAMES.get(sid, f'S{sid}'))
+        for sid in display_stat_ids
+    ]
+    row_template = "  {:<28} {:<6} {:<5}" + " {:>7}" * len(stat_headers)
+    # Stats summed into the team totals row: counting stats, then the
+    # FG/FT components the percentages are recalculated from
+    total_stat_ids = list(dict.fromkeys(
+        [sid for sid in display_stat_ids if sid not in PCT_STAT_IDS]
+        + list(COMPONENT_STAT_NAMES)))
+    return {
+        'row_template': row_template,
+        'header': row_template.format('Player', 'Pos', 'Team', *stat_headers),
+        'separator': (f"  {'─'*28} {'─'*5} {'─'*4}"
+                      + f" {'─'*7}" * len(stat_headers)),
+        'columns': tuple((sid, stat_formatter(sid))
+                         for sid in display_stat_ids),
+        'total_stat_ids': total_stat_ids,
+        'column_stat_ids': list(dict.fromkeys(
+            display_stat_ids + total_stat_ids + [GP_STAT_ID])),
+    }
+
+
+def render_team_table(player_keys, player_info, player_season_stats, layout):
+    """
+    Render one team's player rows, totals row and GP/GL summary.
+
+    All of the per-player and per-stat work of the report happens here,
+    on plain lists and dicts, so it is the single function to target
+    when profiling or running under an alternative interpreter.
+
+    Args:
+        player_keys: The team's player keys, in roster order
+        player_info: {player_key: {name, position, team}}
+        player_season_stats: {player_key: {stat_id: value}}
+        layout: Table layout from build_table_layout()
+
+    Returns:
+        list: Output lines, without trailing newlines
+    """
+    row_template = layout['row_template']
+    separator = layout['separator']
+    columns = layout['columns']
+    missing = '—'
+    lines = [layout['header'], separator]
+
+    # Stats are laid out per column so each column is formatted (and
+    # totalled) in one pass
+    stats_rows = [player_season_stats.get(pkey, {}) for pkey in player_keys]
+    stat_cols = stat_columns(stats_rows, layout['column_stat_ids'])
+    cells = [[missing if val is None else fmt(val)
+              for val in stat_cols[sid]]
+             for sid, fmt in columns]
+    # zip(*cells) transposes the formatted columns back into rows
+    for pkey, row_cells in zip(player_keys, zip(*cells)):
+        info = player_info.get(pkey, {})
+        lines.append(row_template.format(
+            info.get('name', 'Unknown'), info.get('position', 'N/A'),
+            info.get('team', ''), *row_cells))
+
+    # Team totals (counting stats plus FG/FT components), with the
+    # percentages recalculated from the component totals
+    team_totals = sum_stat_columns(stat_cols, layout['total_stat_ids'])
+    for pct_sid, (made, attempted) in PCT_COMPONENTS.items():
+        if made in team_totals and attempted in team_totals:
+            att = team_totals[attempted]
+            team_totals[pct_sid] = (team_totals[made] / att
+                                    if att > 0 else 0)
+    total_gp = sum(int(gp) for gp in stat_cols[GP_STAT_ID]
+                   if gp is not None)
+    total_gl = (len(player_keys) * NBA_TOTAL_GAMES) - total_gp
+
+    lines.append(separator)
+    totals_cells = [fmt(team_totals[sid]) if sid in team_totals else missing
+                    for sid, fmt in columns]
+    lines.append(row_template.format('TEAM TOTALS', '', '', *totals_cells))
+
+    # Team GP / GL summary and component stats
+    summary_parts = [f"  Team GP: {total_gp}", f"GL: {total_gl}"]
+    if '3' in team_totals and '4' in team_totals:
+        summary_parts.append(
+            f"FGM/FGA: {int(team_totals['3'])}/{int(team_totals['4'])}")
+    if '6' in team_totals and '7' in team_totals:
+        summary_parts.append(
+            f"FTM/FTA: {int(team_totals['6'])}/{int(team_totals['7'])}")
+    lines.append(f"  {'  |  '.join(summary_parts)}")
+    return lines
+
+
 def main():
     """Display rosters for all managers with player season stats."""
+    parser = argparse.ArgumentParser(
+        description="Show every manager's roster with player season stats"
+    )
+    add_refresh_argument(parser)
+    args = parser.parse_args()
+
     try:
         print("Connecting to Yahoo Fantasy Basketball API...")
-        client = FantasyBasketballClient()
+        client = FantasyBasketballClient(refresh=args.refresh)
 
-        print(f"\n{'='*100}")
-        print(f"  Rosters & Player Stats (Season 2025-2026) - League ID: {client.league_id}")
-        print(f"{'='*100}")
+        sys.stdout.write("\n".join([
+            f"\n{'='*100}",
+            f"  Rosters & Player Stats (Season 2025-2026) - League ID: {client.league_id}",
+            f"{'='*100}",
+        ]) + "\n")
 
-        # Get raw stat categories with stat_ids from the API
+        # Get raw stat categories with stat_ids from the API, and derive
+        # the stat maps and Roto stat IDs (non-display-only stats)
         raw_categories = client.get_stat_categories_raw()
-        stat_id_map = build_stat_id_map(raw_categories)
-        reverse_stat_map = build_reverse_stat_map(stat_id_map)
-
-        # Build Roto stat IDs from API categories (non-display-only stats)
-        roto_stat_ids = []
-        for cat in raw_categories:
-            sid = str(cat.get('stat_id', ''))
-            is_display_only = str(cat.get('is_only_display_stat', '0'))
-            if sid and is_display_only != '1':
-                roto_stat_ids.append(sid)
-        if not roto_stat_ids:
-            roto_stat_ids = list(ROTO_STAT_NAMES.keys())
+        stat_id_map, reverse_stat_map, roto_stat_ids = parse_stat_categories(
+            raw_categories)
 
         # Per-player columns: only Roto scoring categories
         display_stat_ids = list(roto_stat_ids)
@@ -133,188 +531,71 @@ def main():
             print("\nNo teams found in the league.")
             sys.exit(0)
 
-        # Build stat header
-        stat_headers = []
-        for sid in display_stat_ids:
-            name = stat_id_map.get(sid, ROTO_STAT_NAMES.get(sid, f'S{sid}'))
-            stat_headers.append(name)
+        layout = build_table_layout(display_stat_ids, stat_id_map)
+
+        # Fetch every roster first so player stats can be requested for
+        # the whole league at once instead of once per team
+        rosters, roster_errors = fetch_rosters(client, list(teams))
+
+        team_player_keys = {}
+        player_info = {}
+        for team_key, roster in rosters.items():
+            keys, info = collect_roster_players(roster or [])
+            team_player_keys[team_key] = keys
+            player_info.update(info)
+
+        # Fetch season stats for the whole league in one request set.
+        # get_players_stats_all batches the keys concurrently and parses
+        # the raw response straight into stat_id keys (GP, FGM, FGA, FTM,
+        # FTA included); a failed batch is reported and skipped.  Name
+        # matching then runs once over all players.
+        all_keys = list(dict.fromkeys(
+            k for keys in team_player_keys.values() for k in keys))
+
+        def report(batch_num, num_batches, error):
+            print(f"  ⚠ Could not fetch player stats "
+                  f"(batch {batch_num} of {num_batches}): {error}")
+
+        stats_response = client.get_players_stats_all(
+            all_keys, 'season', on_error=report)
+        player_season_stats = select_player_stats(
+            stats_response, reverse_stat_map.values(), player_info)
 
         # Process each team
         for team_key, team_name in teams.items():
-            print(f"\n{'─'*100}")
-            print(f"  📋 {team_name}")
-            print(f"     Team Key: {team_key}")
-            print(f"{'─'*100}")
-
-            # Get roster
-            try:
-                roster = client.get_team_roster(team_key)
-            except Exception as e:
-                print(f"     ⚠ Could not fetch roster: {e}")
+            # Buffer the team's block and write it in one call
+            lines = [
+                f"\n{'─'*100}",
+                f"  📋 {team_name}",
+                f"     Team Key: {team_key}",
+                f"{'─'*100}",
+            ]
+
+            if team_key in roster_errors:
+                lines.append(f"     ⚠ Could not fetch roster: {roster_errors[team_key]}")
+                sys.stdout.write("\n".join(lines) + "\n")
                 continue
 
-            if not roster:
-                print("     No players on roster.")
+            if not rosters.get(team_key):
+                lines.append("     No players on roster.")
+                sys.stdout.write("\n".join(lines) + "\n")
                 continue
 
-            # Collect player keys/info from roster
-            player_keys = []
-            player_info = {}
-            for player in roster:
-                pkey = player.get('player_key', '')
-                if not pkey:
-                    pkey = player.get('player_id', '')
-                pname = player.get('name', 'Unknown')
-                if isinstance(pname, dict):
-                    pname = pname.get('full', 'Unknown')
-                position = player.get('selected_position', {})
-                if isinstance(position, dict):
-                    position = position.get('position', 'N/A')
-                else:
-                    position = str(position) if position else 'N/A'
-                editorial_team = player.get('editorial_team_abbr', '')
-
-                if pkey:
-                    player_keys.append(pkey)
-                    player_info[pkey] = {
-                        'name': pname,
-                        'position': position,
-                        'team': editorial_team,
-                    }
-
-            # Fetch season stats via library method (augmented stats_id_map
-            # ensures GP, FGM, FGA, FTM, FTA are included)
-            player_season_stats = {}
-            if player_keys:
-                try:
-                    stats_response = client.get_players_stats(
-                        player_keys, 'season')
-                    if isinstance(stats_response, list):
-                        for ps in stats_response:
-                            pid = ps.get('player_id', '')
-                            if not pid:
-                                continue
-                            # Convert display-name keys to stat_id keys
-                            pstats = {}
-                            for key, value in ps.items():
-                                if (key in reverse_stat_map
-                                        and isinstance(value, (int, float))):
-                                    pstats[reverse_stat_map[key]] = value
-                            if pid in player_info:
-                                player_season_stats[pid] = pstats
-                            else:
-                                # Try match by name
-                                pname = ps.get('name', '')
-                                for k, v in player_info.items():
-                                    if v['name'] == pname:
-                                        player_season_stats[k] = pstats
-                                        break
-                except Exception as e:
-                    print(f"     ⚠ Could not fetch player stats: {e}")
-
-            # Print header row
-            header = f"  {'Player':<28} {'Pos':<6} {'Team':<5}"
-            for sh in stat_headers:
-                header += f" {sh:>7}"
-            print(header)
-            print(f"  {'─'*28} {'─'*5} {'─'*4}", end="")
-            for _ in stat_headers:
-                print(f" {'─'*7}", end="")
-            print()
-
-            # Print each player with stats
-            team_totals = {}
-            total_gp = 0
-            for pkey in player_keys:
-                info = player_info.get(pkey, {})
-                pname = info.get('name', 'Unknown')
-                pos = info.get('position', 'N/A')
-                eteam = info.get('team', '')
-                pstats = player_season_stats.get(pkey, {})
-
-                # Accumulate GP
-                gp = pstats.get(GP_STAT_ID, 0)
-                if isinstance(gp, (int, float)):
-                    total_gp += int(gp)
-
-                row = f"  {pname:<28} {pos:<6} {eteam:<5}"
-                for sid in display_stat_ids:
-                    val = pstats.get(sid, '-')
-                    if val != '-':
-                        row += f" {format_stat_value(sid, val):>7}"
-                        # Accumulate totals (skip percentages)
-                        if sid not in ('5', '8'):
-                            team_totals[sid] = team_totals.get(sid, 0) + (
-                                float(val)
-                                if isinstance(val, (int, float)) else 0
-                            )
-                        # Also accumulate components for percentage recalc
-                    else:
-                        row += f" {'—':>7}"
-                print(row)
-
-                # Accumulate component stats for team totals
-                for cid in ('3', '4', '6', '7'):
-                    cval = pstats.get(cid)
-                    if cval is not None and isinstance(cval, (int, float)):
-                        team_totals[cid] = team_totals.get(cid, 0) + cval
-
-            # Print team totals
-            num_players = len(player_keys)
-            total_gl = (num_players * NBA_TOTAL_GAMES) - total_gp
-            print(f"  {'─'*28} {'─'*5} {'─'*4}", end="")
-            for _ in stat_headers:
-                print(f" {'─'*7}", end="")
-            print()
-
-            totals_row = f"  {'TEAM TOTALS':<28} {'':6} {'':5}"
-            for sid in display_stat_ids:
-                if sid == '5':
-                    # Recalculate FG% from FGM/FGA
-                    if '3' in team_totals and '4' in team_totals:
-                        fgm = team_totals['3']
-                        fga = team_totals['4']
-                        pct = fgm / fga if fga > 0 else 0
-                        totals_row += f" {format_stat_value(sid, pct):>7}"
-                    else:
-                        totals_row += f" {'—':>7}"
-                elif sid == '8':
-                    # Recalculate FT% from FTM/FTA
-                    if '6' in team_totals and '7' in team_totals:
-                        ftm = team_totals['6']
-                        fta = team_totals['7']
-                        pct = ftm / fta if fta > 0 else 0
-                        totals_row += f" {format_stat_value(sid, pct):>7}"
-                    else:
-                        totals_row += f" {'—':>7}"
-                elif sid in team_totals:
-                    totals_row += (
-                        f" {format_stat_value(sid, team_totals[sid]):>7}")
-                else:
-                    totals_row += f" {'—':>7}"
-            print(totals_row)
-
-            # Print team GP / GL summary and component stats
-            summary_parts = [f"  Team GP: {total_gp}",
-                             f"GL: {total_gl}"]
-            if '3' in team_totals and '4' in team_totals:
-                summary_parts.append(
-                    f"FGM/FGA: {int(team_totals['3'])}"
-                    f"/{int(team_totals['4'])}")
-            if '6' in team_totals and '7' in team_totals:
-                summary_parts.append(
-                    f"FTM/FTA: {int(team_totals['6'])}"
-                    f"/{int(team_totals['7'])}")
-            print(f"  {'  |  '.join(summary_parts)}")
-
-        print(f"\n{'='*100}")
-        print("  Roto Scoring: Teams are ranked 1-N in each category.")
-        print("  GP = total Games Played across all roster slots, "
-              "GL = Games Left")
-        print("  Categories: FG%, FT%, 3PTM, PTS, REB, AST, STL, BLK, TO")
-        print("  Reference: https://help.yahoo.com/kb/"
-              "rotisserie-scoring-sln6187.html")
-        print(f"{'='*100}\n")
+            lines.extend(render_team_table(
+                team_player_keys[team_key], player_info,
+                player_season_stats, layout))
+            sys.stdout.write("\n".join(lines) + "\n")
+
+        sys.stdout.write("\n".join([
+            f"\n{'='*100}",
+            "  Roto Scoring: Teams are ranked 1-N in each category.",
+            "  GP = total Games Played across all roster slots, "
+            "GL = Games Left",
+            "  Categories: FG%, FT%, 3PTM, PTS, REB, AST, STL, BLK, TO",
+            "  Reference: https://help.yahoo.com/kb/"
+            "rotisserie-scoring-sln6187.html",
+            f"{'='*100}\n",
+        ]) + "\n")
 
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
@@ -8,11 +8,16 @@ FGM/FGA / FTM/FTA component stats.
 Usage:
     python show_team.py
     python show_team.py --team-key 466.l.21454.t.1
+    python show_team.py --refresh
 """
 import argparse
 import sys
+
+from cache import add_refresh_argument
 from client import FantasyBasketballClient
-from show_rosters import build_stat_id_map, build_reverse_stat_map
+from show_rosters import (PCT_STAT_IDS, make_stat_filter,
+                          parse_stat_categories, stat_columns,
+                          stat_formatter, sum_stat_columns)
 
 
 # Standard Roto stat categories
@@ -35,19 +40,15 @@ COMPONENT_STAT_NAMES = {
     '7': 'FTA',
 }
 
+# FG/FT component stat IDs, shown next to their percentages
+COMPONENT_STAT_IDS = frozenset(COMPONENT_STAT_NAMES)
+
 GP_STAT_ID = '0'
 NBA_TOTAL_GAMES = 82
 
-
-def fmt(stat_id, value):
-    """Format a stat value for display."""
-    if stat_id in ('5', '8'):
-        return f"{value:.3f}" if isinstance(value, (int, float)) else str(value)
-    if isinstance(value, float) and value == int(value):
-        return str(int(value))
-    if isinstance(value, float):
-        return f"{value:.1f}"
-    return str(value)
+# Report rules
+BANNER = '=' * 120
+RULE = '─' * 116
 
 
 def main():
@@ -58,25 +59,18 @@ def main():
         '--team-key',
         help='Yahoo team key. If not provided, you will be prompted.'
     )
+    add_refresh_argument(parser)
     args = parser.parse_args()
 
     try:
         print("Connecting to Yahoo Fantasy Basketball API...")
-        client = FantasyBasketballClient()
+        client = FantasyBasketballClient(refresh=args.refresh)
 
-        # Get raw stat categories
+        # Get raw stat categories and derive the stat maps (stat_ids are
+        # interned, so the lookups below compare by identity)
         raw_categories = client.get_stat_categories_raw()
-        stat_id_map = {}
-        roto_stat_ids = []
-        for cat in raw_categories:
-            sid = str(cat.get('stat_id', ''))
-            dname = cat.get('display_name', f'Stat {sid}')
-            stat_id_map[sid] = dname
-            is_display_only = str(cat.get('is_only_display_stat', '0'))
-            if sid and is_display_only != '1':
-                roto_stat_ids.append(sid)
-        if not roto_stat_ids:
-            roto_stat_ids = list(ROTO_STAT_NAMES.keys())
+        stat_id_map, reverse_stat_map, roto_stat_ids = parse_stat_categories(
+            raw_categories)
 
         # Get teams
         teams = client.get_teams()
@@ -117,13 +111,16 @@ def main():
                 display_ids.extend(['3', '4', '5'])
             elif sid == '8':
                 display_ids.extend(['6', '7', '8'])
-            elif sid not in ('3', '4', '6', '7'):
+            elif sid not in COMPONENT_STAT_IDS:
                 display_ids.append(sid)
 
         # Get roster
         roster = client.get_team_roster(team_key)
+        # Player details are kept in lists parallel to player_keys
         player_keys = []
-        player_info = {}
+        p_names = []
+        p_positions = []
+        p_teams = []
         for player in roster:
             pkey = player.get('player_key', '') or player.get(
                 'player_id', '')
@@ -136,159 +133,144 @@ def main():
             eteam = player.get('editorial_team_abbr', '')
             if pkey:
                 player_keys.append(pkey)
-                player_info[pkey] = {
-                    'name': pname, 'position': str(pos), 'team': eteam}
-
-        # Build reverse mapping using shared utility
-        reverse_stat_map = build_reverse_stat_map(stat_id_map)
-
-        # Fetch stats via library method (augmented stats_id_map includes
-        # GP, FGM, FGA, FTM, FTA)
-        stats_response = client.get_players_stats(player_keys, 'season')
+                p_names.append(pname)
+                p_positions.append(str(pos))
+                p_teams.append(eteam)
+
+        # Fetch stats for the roster in one call; get_players_stats_all
+        # batches the keys concurrently and returns rows keyed by stat_id
+        # (GP, FGM, FGA, FTM, FTA included).  A failed batch is reported
+        # and skipped.
+        def report(batch_num, num_batches, error):
+            print(f"  ⚠ Could not fetch player stats "
+                  f"(batch {batch_num} of {num_batches}): {error}")
+
+        stats_response = client.get_players_stats_all(
+            player_keys, 'season', on_error=report)
+        # Values are coerced to float here, once, and non-numeric ones
+        # dropped, so below a stat is either a float or missing (None)
+        convert = make_stat_filter(reverse_stat_map.values())
         player_stats = {}
-        if isinstance(stats_response, list):
-            for ps in stats_response:
-                pid = ps.get('player_id', '')
-                if pid:
-                    pstats = {}
-                    for key, value in ps.items():
-                        if (key in reverse_stat_map
-                                and isinstance(value, (int, float))):
-                            pstats[reverse_stat_map[key]] = value
-                    player_stats[pid] = pstats
-
-        # Build header names
+        for ps in stats_response:
+            pid = ps.get('player_id', '')
+            if pid:
+                player_stats[pid] = convert(ps)
+
+        # Resolve each column's header name and value formatter once
         headers = []
+        formatters = []
         for sid in display_ids:
             name = stat_id_map.get(
                 sid, ROTO_STAT_NAMES.get(
                     sid, COMPONENT_STAT_NAMES.get(
                         sid, 'GP' if sid == GP_STAT_ID else f'S{sid}')))
             headers.append(name)
+            formatters.append(stat_formatter(sid))
+
+        # Buffer the report and write it in one call
+        out = []
+        out.append(f"\n{BANNER}")
+        out.append(f"  {team_name}  ({team_key})")
+        out.append(BANNER)
+        out.append(f"\n  SEASON TOTALS")
+        out.append(f"  {RULE}")
+
+        # Header, player and totals rows share one format template
+        row_template = ("  {:<24} {:<5} {:<4}" + " {:>7}" * len(headers)
+                        + "  {:>3}")
+        out.append(row_template.format('Player', 'Pos', 'Tm', *headers, 'GL'))
+        # Column separator under the header and above the totals row
+        separator = (f"  {'─'*24} {'─'*4} {'─'*3}"
+                     + f" {'─'*7}" * len(headers) + f"  {'─'*3}")
+        out.append(separator)
 
-        # Print
-        print(f"\n{'='*120}")
-        print(f"  {team_name}  ({team_key})")
-        print(f"{'='*120}")
-        print(f"\n  SEASON TOTALS")
-        print(f"  {'─'*116}")
-
-        hdr = f"  {'Player':<24} {'Pos':<5} {'Tm':<4}"
-        for h in headers:
-            hdr += f" {h:>7}"
-        hdr += f"  {'GL':>3}"
-        print(hdr)
-        print(f"  {'─'*24} {'─'*4} {'─'*3}", end="")
-        for _ in headers:
-            print(f" {'─'*7}", end="")
-        print(f"  {'─'*3}")
-
-        team_totals = {}
         total_gp = 0
 
-        for pkey in player_keys:
-            info = player_info.get(pkey, {})
+        for i, pkey in enumerate(player_keys):
             pstats = player_stats.get(pkey, {})
 
-            gp = pstats.get(GP_STAT_ID, 0)
-            if isinstance(gp, (int, float)):
-                total_gp += int(gp)
-                gl = NBA_TOTAL_GAMES - int(gp)
-            else:
-                gl = '—'
-
-            row = (f"  {info.get('name', '?'):<24} "
-                   f"{info.get('position', '?'):<5} "
-                   f"{info.get('team', ''):<4}")
-            for sid in display_ids:
-                val = pstats.get(sid, '-')
-                if val != '-' and isinstance(val, (int, float)):
-                    row += f" {fmt(sid, val):>7}"
-                    if sid not in ('5', '8'):
-                        team_totals[sid] = (
-                            team_totals.get(sid, 0) + float(val))
-                else:
-                    row += f" {'—':>7}"
-
-            # Accumulate components
-            for cid in ('3', '4', '6', '7'):
-                cval = pstats.get(cid)
-                if cval is not None and isinstance(cval, (int, float)):
-                    team_totals[cid] = team_totals.get(cid, 0) + cval
-
-            row += f"  {gl:>3}"
-            print(row)
-
-        # Team totals row
-        print(f"  {'─'*24} {'─'*4} {'─'*3}", end="")
-        for _ in headers:
-            print(f" {'─'*7}", end="")
-        print(f"  {'─'*3}")
+            gp = int(pstats.get(GP_STAT_ID, 0))
+            total_gp += gp
+            gl = NBA_TOTAL_GAMES - gp
+
+            # The player's values in column order, so each cell reads
+            # its value and formatter positionally
+            values = [pstats.get(sid) for sid in display_ids]
+            cells = ['—' if val is None else format_value(val)
+                     for format_value, val in zip(formatters, values)]
+
+            out.append(row_template.format(
+                p_names[i], p_positions[i], p_teams[i], *cells, gl))
+
+        # Team totals row.  Counting stats and the FG/FT components are
+        # summed a column at a time; each component is summed once even
+        # when it is also a display column.  Missing stats stay absent
+        # from team_totals rather than reading as 0.
+        total_stat_ids = list(dict.fromkeys(
+            [sid for sid in display_ids if sid not in PCT_STAT_IDS]
+            + list(COMPONENT_STAT_NAMES)))
+        stats_rows = [player_stats.get(pkey, {}) for pkey in player_keys]
+        team_totals = sum_stat_columns(
+            stat_columns(stats_rows, total_stat_ids), total_stat_ids)
+        out.append(separator)
 
         num_players = len(player_keys)
         total_gl = (num_players * NBA_TOTAL_GAMES) - total_gp
 
-        tot_row = f"  {'TOTALS':<24} {'':5} {'':4}"
-        for sid in display_ids:
+        totals_cells = []
+        for sid, format_value in zip(display_ids, formatters):
             if sid == '5' and '3' in team_totals and '4' in team_totals:
                 pct = (team_totals['3'] / team_totals['4']
                        if team_totals['4'] > 0 else 0)
-                tot_row += f" {fmt(sid, pct):>7}"
+                totals_cells.append(format_value(pct))
             elif sid == '8' and '6' in team_totals and '7' in team_totals:
                 pct = (team_totals['6'] / team_totals['7']
                        if team_totals['7'] > 0 else 0)
-                tot_row += f" {fmt(sid, pct):>7}"
+                totals_cells.append(format_value(pct))
             elif sid in team_totals:
-                tot_row += f" {fmt(sid, team_totals[sid]):>7}"
+                totals_cells.append(format_value(team_totals[sid]))
             else:
-                tot_row += f" {'—':>7}"
-        tot_row += f"  {total_gl:>3}"
-        print(tot_row)
+                totals_cells.append('—')
+        out.append(row_template.format('TOTALS', '', '', *totals_cells,
+                                       total_gl))
 
         # Per-game averages
-        print(f"\n  PER-GAME AVERAGES (season total / GP)")
-        print(f"  {'─'*116}")
-
-        hdr2 = f"  {'Player':<24} {'GP':>4}"
-        avg_ids = [s for s in roto_stat_ids if s not in ('5', '8')]
-        for sid in avg_ids:
-            name = stat_id_map.get(sid, ROTO_STAT_NAMES.get(sid, f'S{sid}'))
-            hdr2 += f" {name:>7}"
-        print(hdr2)
-        print(f"  {'─'*24} {'─'*4}", end="")
-        for _ in avg_ids:
-            print(f" {'─'*7}", end="")
-        print()
-
-        for pkey in player_keys:
-            info = player_info.get(pkey, {})
+        out.append(f"\n  PER-GAME AVERAGES (season total / GP)")
+        out.append(f"  {RULE}")
+
+        avg_ids = [s for s in roto_stat_ids if s not in PCT_STAT_IDS]
+        avg_headers = [
+            stat_id_map.get(sid, ROTO_STAT_NAMES.get(sid, f'S{sid}'))
+            for sid in avg_ids
+        ]
+        avg_template = "  {:<24} {:>4}" + " {:>7}" * len(avg_ids)
+        out.append(avg_template.format('Player', 'GP', *avg_headers))
+        out.append(f"  {'─'*24} {'─'*4}" + f" {'─'*7}" * len(avg_ids))
+
+        for pkey, pname in zip(player_keys, p_names):
             pstats = player_stats.get(pkey, {})
             gp = pstats.get(GP_STAT_ID, 0)
 
-            row = f"  {info.get('name', '?'):<24}"
-            if isinstance(gp, (int, float)) and gp > 0:
-                row += f" {int(gp):>4}"
+            if gp > 0:
+                gp_cell = int(gp)
+                cells = []
                 for sid in avg_ids:
                     val = pstats.get(sid)
-                    if val is not None and isinstance(val, (int, float)):
-                        avg = val / gp
-                        row += f" {avg:>7.1f}"
-                    else:
-                        row += f" {'—':>7}"
+                    cells.append('—' if val is None else f"{val / gp:.1f}")
             else:
-                row += f" {'—':>4}"
-                for _ in avg_ids:
-                    row += f" {'—':>7}"
-            print(row)
+                gp_cell = '—'
+                cells = ['—'] * len(avg_ids)
+            out.append(avg_template.format(pname, gp_cell, *cells))
 
-        print(f"\n  Team GP: {total_gp}  |  Team GL: {total_gl}")
+        out.append(f"\n  Team GP: {total_gp}  |  Team GL: {total_gl}")
         if '3' in team_totals and '4' in team_totals:
-            print(f"  FGM/FGA: {int(team_totals['3'])}"
-                  f"/{int(team_totals['4'])}")
+            out.append(f"  FGM/FGA: {int(team_totals['3'])}"
+                       f"/{int(team_totals['4'])}")
         if '6' in team_totals and '7' in team_totals:
-            print(f"  FTM/FTA: {int(team_totals['6'])}"
-                  f"/{int(team_totals['7'])}")
-        print(f"{'='*120}\n")
+            out.append(f"  FTM/FTA: {int(team_totals['6'])}"
+                       f"/{int(team_totals['7'])}")
+        out.append(f"{BANNER}\n")
+        sys.stdout.write("\n".join(out) + "\n")
 
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
@@ -4,16 +4,29 @@ Show all teams in your fantasy basketball league.
 
 Usage:
     python show_teams.py
+    python show_teams.py --refresh
 """
+import argparse
 import sys
-from client import FantasyBasketballClient
+
+from cache import add_refresh_argument
 
 
 def main():
     """Display all teams in the league"""
+    parser = argparse.ArgumentParser(
+        description="Show all teams in the league"
+    )
+    add_refresh_argument(parser)
+    args = parser.parse_args()
+
     try:
+        # Imported here so the module can be imported without the
+        # Yahoo API dependencies (e.g. by tests)
+        from client import FantasyBasketballClient
+
         print("Connecting to Yahoo Fantasy Basketball API...")
-        client = FantasyBasketballClient()
+        client = FantasyBasketballClient(refresh=args.refresh)
         
         print(f"\n{'='*60}")
         print(f"League ID: {client.league_id}")
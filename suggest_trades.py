@@ -7,10 +7,24 @@ and suggests potential trades where both teams could benefit.
 
 Usage:
     python suggest_trades.py
+    python suggest_trades.py --refresh
 """
+import argparse
+import heapq
 import sys
 from collections import defaultdict
-from client import FantasyBasketballClient
+from dataclasses import dataclass
+
+from cache import add_refresh_argument
+
+
+@dataclass
+class TeamStats:
+    """One team's name and {stat_id: value} totals."""
+    __slots__ = ('name', 'stats')
+
+    name: str
+    stats: dict
 
 
 def analyze_team_strengths(standings, stat_categories):
@@ -33,110 +47,172 @@ def analyze_team_strengths(standings, stat_categories):
         team_name = team.get('name', 'Unknown')
         stats = team.get('team_stats', {}).get('stats', [])
         
-        team_stats[team_key] = {
-            'name': team_name,
-            'stats': {stat['stat_id']: float(stat.get('value', 0)) for stat in stats if stat.get('value') != '-'}
-        }
+        team_stats[team_key] = TeamStats(
+            name=team_name,
+            stats={stat['stat_id']: float(stat.get('value', 0)) for stat in stats if stat.get('value') != '-'}
+        )
     
-    # For each stat category, rank teams
+    # For each stat category, rank teams.  Each ranking is one column
+    # (every team's value for a single stat), collected in a single pass
+    # over the (team, stat) cells
     stat_rankings = defaultdict(list)
-    for stat_id in set(s for t in team_stats.values() for s in t['stats'].keys()):
-        # Get all teams that have this stat
-        teams_with_stat = [(tk, tv['name'], tv['stats'].get(stat_id, 0)) 
-                          for tk, tv in team_stats.items() if stat_id in tv['stats']]
-        
-        # Sort by stat value (descending)
+    for tk, tv in team_stats.items():
+        for stat_id, value in tv.stats.items():
+            stat_rankings[stat_id].append((tk, tv.name, value))
+    
+    # Sort by stat value (descending)
+    for teams_with_stat in stat_rankings.values():
         teams_with_stat.sort(key=lambda x: x[2], reverse=True)
-        stat_rankings[stat_id] = teams_with_stat
     
-    # Determine strengths and weaknesses for each team
+    # Determine strengths and weaknesses a column at a time: a team's
+    # rank is its position in the sorted column, so the thresholds are
+    # computed once per stat and no per-team rank lookup is needed
+    strengths = {tk: [] for tk in team_stats}
+    weaknesses = {tk: [] for tk in team_stats}
+    for stat_id, rankings in stat_rankings.items():
+        total_teams = len(rankings)
+        # Top 25% = strength, Bottom 25% = weakness
+        strong_cutoff = total_teams * 0.25
+        weak_cutoff = total_teams * 0.75
+        for team_rank, (tk, _, _) in enumerate(rankings):
+            if team_rank < strong_cutoff:
+                strengths[tk].append(stat_id)
+            elif team_rank > weak_cutoff:
+                weaknesses[tk].append(stat_id)
+    
     for team_key, team_data in team_stats.items():
-        strengths = []
-        weaknesses = []
-        
-        for stat_id, rankings in stat_rankings.items():
-            if stat_id not in team_data['stats']:
-                continue
-                
-            # Find team's rank in this stat
-            team_rank = next((i for i, (tk, _, _) in enumerate(rankings) if tk == team_key), None)
-            
-            if team_rank is not None:
-                total_teams = len(rankings)
-                # Top 25% = strength, Bottom 25% = weakness
-                if team_rank < total_teams * 0.25:
-                    strengths.append(stat_id)
-                elif team_rank > total_teams * 0.75:
-                    weaknesses.append(stat_id)
-        
         team_analysis[team_key] = {
-            'name': team_data['name'],
-            'strengths': strengths,
-            'weaknesses': weaknesses,
-            'stats': team_data['stats']
+            'name': team_data.name,
+            'strengths': strengths[team_key],
+            'weaknesses': weaknesses[team_key],
+            'stats': team_data.stats
         }
     
     return team_analysis, stat_rankings
 
 
-def suggest_trade_partners(team_analysis, your_team_key=None):
+# Number of set bits in a category mask (int.bit_count needs Python 3.10)
+try:
+    _popcount = int.bit_count
+except AttributeError:
+    def _popcount(mask):
+        return bin(mask).count('1')
+
+
+def _mask_to_stat_ids(mask, stat_ids):
+    """Decode a category bitmask into the stat_ids of its set bits."""
+    return [stat_id for bit, stat_id in enumerate(stat_ids) if mask >> bit & 1]
+
+
+def suggest_trade_partners(team_analysis, your_team_key=None, limit=None):
     """
     Suggest potential trade partners based on complementary needs.
     
     Args:
         team_analysis: Analysis of all teams
         your_team_key: Your team key (if None, suggests trades for all teams)
+        limit: If given, return only this many of the best suggestions
         
     Returns:
-        list: List of trade suggestions
+        list: List of trade suggestions, best synergy first
     """
     suggestions = []
     
-    teams_to_analyze = [your_team_key] if your_team_key else list(team_analysis.keys())
+    # Encode each team's strengths and weaknesses as bitmasks, one bit
+    # per stat_id, so every pair is compared with integer ANDs rather
+    # than by building and intersecting sets
+    stat_bits = {}
+    masks = {}
+    for team_key, team in team_analysis.items():
+        strong = weak = 0
+        for stat_id in team['strengths']:
+            strong |= 1 << stat_bits.setdefault(stat_id, len(stat_bits))
+        for stat_id in team['weaknesses']:
+            weak |= 1 << stat_bits.setdefault(stat_id, len(stat_bits))
+        masks[team_key] = (strong, weak)
+    stat_ids = list(stat_bits)
     
-    for team_a_key in teams_to_analyze:
+    team_keys = list(team_analysis.keys())
+    
+    for i, team_a_key in enumerate(team_keys):
+        if your_team_key:
+            if team_a_key != your_team_key:
+                continue
+            partner_keys = [tk for tk in team_keys if tk != team_a_key]
+        else:
+            # A <--> B is the same trade as B <--> A, so each unordered
+            # pair is evaluated once
+            partner_keys = team_keys[i + 1:]
         team_a = team_analysis[team_a_key]
+        a_strong, a_weak = masks[team_a_key]
         
-        for team_b_key, team_b in team_analysis.items():
-            if team_a_key == team_b_key:
-                continue
+        for team_b_key in partner_keys:
+            team_b = team_analysis[team_b_key]
+            b_strong, b_weak = masks[team_b_key]
             
             # Find complementary strengths/weaknesses
             # Team A is weak where Team B is strong
-            beneficial_cats_for_a = set(team_a['weaknesses']) & set(team_b['strengths'])
+            a_gets = a_weak & b_strong
             # Team B is weak where Team A is strong  
-            beneficial_cats_for_b = set(team_b['weaknesses']) & set(team_a['strengths'])
+            b_gets = b_weak & a_strong
             
-            if beneficial_cats_for_a and beneficial_cats_for_b:
+            if a_gets and b_gets:
                 suggestions.append({
                     'team_a': team_a['name'],
                     'team_a_key': team_a_key,
                     'team_b': team_b['name'],
                     'team_b_key': team_b_key,
-                    'team_a_gets': list(beneficial_cats_for_a),
-                    'team_b_gets': list(beneficial_cats_for_b),
-                    'synergy_score': len(beneficial_cats_for_a) + len(beneficial_cats_for_b)
+                    'team_a_gets': _mask_to_stat_ids(a_gets, stat_ids),
+                    'team_b_gets': _mask_to_stat_ids(b_gets, stat_ids),
+                    'synergy_score': _popcount(a_gets) + _popcount(b_gets)
                 })
     
-    # Sort by synergy score
+    # Sort by synergy score.  When only the top few are wanted a bounded
+    # heap avoids sorting every pair (nlargest keeps the sort's order)
+    if limit is not None:
+        return heapq.nlargest(limit, suggestions,
+                              key=lambda x: x['synergy_score'])
     suggestions.sort(key=lambda x: x['synergy_score'], reverse=True)
     
     return suggestions
 
 
-def get_stat_name(stat_id, stat_categories):
-    """Get human-readable stat name"""
+def build_stat_name_map(stat_categories):
+    """
+    Map stat_id to human-readable stat name.
+
+    Built once so each name lookup is a dict get instead of a scan of
+    the categories.  The first category listed for a stat_id wins.
+
+    Args:
+        stat_categories: List of stat category dicts from league settings
+
+    Returns:
+        dict: Mapping of stat_id (str) to display_name (str)
+    """
+    stat_name_map = {}
     for cat in stat_categories:
-        if str(cat.get('stat_id')) == str(stat_id):
-            return cat.get('display_name', f'Stat {stat_id}')
-    return f'Stat {stat_id}'
+        stat_id = str(cat.get('stat_id'))
+        stat_name_map.setdefault(
+            stat_id, cat.get('display_name', f'Stat {stat_id}'))
+    return stat_name_map
 
 
 def main():
     """Analyze teams and suggest trades"""
+    parser = argparse.ArgumentParser(
+        description="Suggest trades based on team strengths and weaknesses"
+    )
+    add_refresh_argument(parser)
+    args = parser.parse_args()
+
     try:
+        # Imported here so the module can be imported without the
+        # Yahoo API dependencies (e.g. by tests)
+        from client import FantasyBasketballClient
+
         print("Connecting to Yahoo Fantasy Basketball API...")
-        client = FantasyBasketballClient()
+        client = FantasyBasketballClient(refresh=args.refresh)
         
         print(f"\n{'='*80}")
         print(f"Trade Analysis - League ID: {client.league_id}")
@@ -147,62 +223,67 @@ def main():
         standings = client.get_standings()
         settings = client.get_league_settings()
         stat_categories = settings.get('stat_categories', {}).get('stats', [])
+        stat_name_map = build_stat_name_map(stat_categories)
         
         # Analyze teams
         print("Analyzing team strengths and weaknesses...\n")
         team_analysis, stat_rankings = analyze_team_strengths(standings, stat_categories)
         
+        # Buffer the report and write it in one call
+        out = []
+
         # Display team analysis
-        print("="*80)
-        print("TEAM ANALYSIS")
-        print("="*80)
+        out.append("="*80)
+        out.append("TEAM ANALYSIS")
+        out.append("="*80)
         
         for team_key, analysis in team_analysis.items():
-            print(f"\n{analysis['name']}:")
-            print(f"  Strengths (Top 25%):")
+            out.append(f"\n{analysis['name']}:")
+            out.append(f"  Strengths (Top 25%):")
             if analysis['strengths']:
                 for stat_id in analysis['strengths']:
-                    stat_name = get_stat_name(stat_id, stat_categories)
-                    print(f"    - {stat_name}")
+                    stat_name = stat_name_map.get(str(stat_id), f'Stat {stat_id}')
+                    out.append(f"    - {stat_name}")
             else:
-                print(f"    - None identified")
+                out.append(f"    - None identified")
             
-            print(f"  Weaknesses (Bottom 25%):")
+            out.append(f"  Weaknesses (Bottom 25%):")
             if analysis['weaknesses']:
                 for stat_id in analysis['weaknesses']:
-                    stat_name = get_stat_name(stat_id, stat_categories)
-                    print(f"    - {stat_name}")
+                    stat_name = stat_name_map.get(str(stat_id), f'Stat {stat_id}')
+                    out.append(f"    - {stat_name}")
             else:
-                print(f"    - None identified")
+                out.append(f"    - None identified")
         
         # Suggest trades
-        print(f"\n{'='*80}")
-        print("TRADE SUGGESTIONS")
-        print("="*80)
-        print("\nBased on complementary team needs, here are potential trade partners:\n")
+        out.append(f"\n{'='*80}")
+        out.append("TRADE SUGGESTIONS")
+        out.append("="*80)
+        out.append("\nBased on complementary team needs, here are potential trade partners:\n")
         
-        suggestions = suggest_trade_partners(team_analysis)
+        suggestions = suggest_trade_partners(team_analysis, limit=10)
         
         if not suggestions:
-            print("No clear trade opportunities found based on current team stats.")
+            out.append("No clear trade opportunities found based on current team stats.")
         else:
-            for i, suggestion in enumerate(suggestions[:10], 1):  # Show top 10
-                print(f"{i}. {suggestion['team_a']} <--> {suggestion['team_b']}")
-                print(f"   Synergy Score: {suggestion['synergy_score']}/10")
-                print(f"   {suggestion['team_a']} would improve in:")
+            for i, suggestion in enumerate(suggestions, 1):  # Top 10
+                out.append(f"{i}. {suggestion['team_a']} <--> {suggestion['team_b']}")
+                out.append(f"   Synergy Score: {suggestion['synergy_score']}/10")
+                out.append(f"   {suggestion['team_a']} would improve in:")
                 for stat_id in suggestion['team_a_gets']:
-                    stat_name = get_stat_name(stat_id, stat_categories)
-                    print(f"     - {stat_name}")
-                print(f"   {suggestion['team_b']} would improve in:")
+                    stat_name = stat_name_map.get(str(stat_id), f'Stat {stat_id}')
+                    out.append(f"     - {stat_name}")
+                out.append(f"   {suggestion['team_b']} would improve in:")
                 for stat_id in suggestion['team_b_gets']:
-                    stat_name = get_stat_name(stat_id, stat_categories)
-                    print(f"     - {stat_name}")
-                print()
+                    stat_name = stat_name_map.get(str(stat_id), f'Stat {stat_id}')
+                    out.append(f"     - {stat_name}")
+                out.append('')
         
-        print("="*80)
-        print("\nNOTE: These suggestions are based on statistical analysis.")
-        print("Consider player values, injury status, and schedule when proposing trades.")
-        print("="*80)
+        out.append("="*80)
+        out.append("\nNOTE: These suggestions are based on statistical analysis.")
+        out.append("Consider player values, injury status, and schedule when proposing trades.")
+        out.append("="*80)
+        sys.stdout.write("\n".join(out) + "\n")
         
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
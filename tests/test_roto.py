@@ -4,15 +4,50 @@ Tests for RotoCalculator and TradeSimulator.
 These tests verify the core Roto scoring logic using mock data,
 without requiring Yahoo Fantasy API access.
 """
+import copy
 import sys
 import os
 import unittest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 # Add parent directory to path so we can import the modules
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 
+# Third-party modules the API-facing scripts import at module level
+YAHOO_MOCK_MODULES = ('yahoo_oauth', 'yahoo_fantasy_api', 'yahoo_fantasy_api.league',
+                      'yahoo_fantasy_api.game', 'yahoo_fantasy_api.team', 'dotenv')
+
+
+def _install_yahoo_mocks():
+    """
+    Stand in empty modules for the Yahoo API packages that aren't installed.
+
+    Returns:
+        dict: {module_name: original_or_None} for _restore_modules()
+    """
+    import types
+    saved = {}
+    for mod_name in YAHOO_MOCK_MODULES:
+        if mod_name not in sys.modules:
+            saved[mod_name] = sys.modules.get(mod_name)
+            sys.modules[mod_name] = types.ModuleType(mod_name)
+
+    # Add required attributes
+    sys.modules['yahoo_oauth'].OAuth2 = MagicMock
+    sys.modules['dotenv'].load_dotenv = lambda: None
+    return saved
+
+
+def _restore_modules(saved):
+    """Undo _install_yahoo_mocks()."""
+    for mod_name, original in saved.items():
+        if original is None:
+            sys.modules.pop(mod_name, None)
+        else:
+            sys.modules[mod_name] = original
+
+
 class MockLeagueData:
     """Mock LeagueData for testing without API access."""
 
@@ -88,8 +123,23 @@ class MockLeagueData:
 class TestRotoCalculator(unittest.TestCase):
     """Test the RotoCalculator class."""
 
+    # Tests that modify the league data get a private copy; the rest
+    # share one read-only fixture
+    MUTATING_TESTS = {
+        'test_tied_values_average_rank_points',
+        'test_baseline_standings_cached_until_invalidated',
+        'test_new_team_stats_dict_refreshes_baseline',
+        'test_standings_gaps_cached_with_baseline',
+    }
+
+    @classmethod
+    def setUpClass(cls):
+        cls._template_ld = MockLeagueData()
+
     def setUp(self):
-        self.ld = MockLeagueData()
+        self.ld = self._template_ld
+        if self._testMethodName in self.MUTATING_TESTS:
+            self.ld = copy.deepcopy(self.ld)
         from roto_calculator import RotoCalculator
         self.calc = RotoCalculator(self.ld)
 
@@ -143,12 +193,136 @@ class TestRotoCalculator(unittest.TestCase):
         # They share positions 2 and 3 (team.3=5200 is #1), so average = 2.5
         self.assertAlmostEqual(pts_a, 2.5, places=1)
 
+    def test_baseline_standings_cached_until_invalidated(self):
+        """Baseline standings should be reused until the cache is cleared."""
+        first = self.calc.calculate_standings()
+        self.assertIs(self.calc.calculate_standings(), first)
+
+        self.ld.team_stats['team.4']['12'] = 9999
+        self.calc.invalidate_cache()
+        result = self.calc.calculate_standings()
+        self.assertIsNot(result, first)
+        self.assertEqual(result['category_points']['team.4']['12'], 4)
+
+    def test_new_team_stats_dict_refreshes_baseline(self):
+        """Replacing ld.team_stats should bypass the cached baseline."""
+        first = self.calc.calculate_standings()
+        self.ld.team_stats = {tk: dict(s) for tk, s in self.ld.team_stats.items()}
+        self.assertIsNot(self.calc.calculate_standings(), first)
+
+    def test_rank_delta_matches_full_recompute(self):
+        """rank_delta should agree with a full calculate_standings."""
+        from copy import deepcopy
+        cases = [
+            {'12': 5300, '19': 650},   # team.1 passes team.3 in PTS
+            {'12': 4800, '19': 500},   # ties with team.2 in PTS and TO
+            {'12': 4000, '15': 0},     # drops to last
+        ]
+        for change in cases:
+            new_stats = deepcopy(self.ld.team_stats)
+            new_stats['team.1'].update(change)
+            new_stats['team.2']['16'] = new_stats['team.2']['16'] - 50
+            full = self.calc.calculate_standings(new_stats)['roto_scores']
+            base = self.calc.calculate_standings()['roto_scores']
+            deltas = self.calc.rank_delta(
+                'team.1', 'team.2',
+                {'team.1': new_stats['team.1'], 'team.2': new_stats['team.2']})
+            for tk in ('team.1', 'team.2'):
+                self.assertAlmostEqual(deltas[tk], full[tk] - base[tk])
+
+    def test_could_change_ranks(self):
+        """Only moves that reach a neighbour's value may change ranks."""
+        row = self.ld.team_stats['team.4']
+        # PTS 4600 -> 4700 stays below team.2's 4800
+        self.assertFalse(self.calc.could_change_ranks(
+            {'team.4': {**row, '12': 4700}}))
+        # Reaching team.2's value creates a tie
+        self.assertTrue(self.calc.could_change_ranks(
+            {'team.4': {**row, '12': 4800}}))
+        # TO 550 -> 580 stays better than team.1's 600
+        self.assertFalse(self.calc.could_change_ranks(
+            {'team.4': {**row, '19': 580}}))
+        # team.4 and team.2 are TO neighbours, so the check gives up
+        self.assertTrue(self.calc.could_change_ranks(
+            {'team.4': {**row, '19': 540},
+             'team.2': self.ld.team_stats['team.2']}))
+
+    def test_could_change_ranks_leaving_tie(self):
+        """Moving out of a baseline tie changes points even without crossing."""
+        from roto_calculator import RotoCalculator
+        from trade_simulator import TradeSimulator
+        ld = copy.deepcopy(self._template_ld)
+        ld.roto_stat_ids = ['12']
+        ld.team_stats = {'team.1': {'12': 10}, 'team.2': {'12': 10},
+                         'team.3': {'12': 5}, 'team.4': {'12': 1}}
+        calc = RotoCalculator(ld)
+        new_stats = {'team.2': {'12': 8}, 'team.4': {'12': 1.5}}
+        self.assertTrue(calc.could_change_ranks(new_stats))
+
+        full = calc.calculate_standings({**ld.team_stats, **new_stats})['roto_scores']
+        base = calc.calculate_standings()['roto_scores']
+        self.assertEqual(full['team.2'] - base['team.2'], -0.5)
+        self.assertEqual(full['team.1'] - base['team.1'], 0.5)
+
+        # A trade that moves team.2 off the tie (10 -> 9.5) and team.4 up
+        # to 1.5, crossing no one, must match a full recompute
+        ld.player_stats = {'pa': {'0': 30.0, '12': 2.0},
+                           'pb': {'0': 30.0, '12': 1.5}}
+        sim = TradeSimulator(ld, remaining_games=30)
+        result = sim.simulate_trade(['pa'], ['pb'], 'team.2', 'team.4')
+        traded = {**ld.team_stats, 'team.2': {'12': 9.5}, 'team.4': {'12': 1.5}}
+        full = calc.calculate_standings(traded)['roto_scores']
+        self.assertEqual(result['my_delta'], full['team.2'] - base['team.2'])
+        self.assertEqual(result['their_delta'], full['team.4'] - base['team.4'])
+        self.assertEqual(result['my_delta'], -0.5)
+
+    def test_could_gain(self):
+        """A team can only gain if it improves or the rival gets worse."""
+        mine = self.ld.team_stats['team.1']
+        rival = self.ld.team_stats['team.2']
+        # I lose points, rival gains points and commits fewer turnovers
+        self.assertFalse(self.calc.could_gain('team.1', 'team.2', {
+            'team.1': {**mine, '12': mine['12'] - 300},
+            'team.2': {**rival, '12': rival['12'] + 300, '19': 400}}))
+        # Fewer turnovers for me is an improvement
+        self.assertTrue(self.calc.could_gain('team.1', 'team.2', {
+            'team.1': {**mine, '19': 100}, 'team.2': rival}))
+        # Rival getting worse may let me pass them
+        self.assertTrue(self.calc.could_gain('team.1', 'team.2', {
+            'team.1': mine, 'team.2': {**rival, '15': 0}}))
+
+    def test_assign_rank_points_averages_ties(self):
+        """Tied values should share the average of their rank points."""
+        from roto_calculator import _assign_rank_points
+        self.assertEqual(_assign_rank_points([9, 7, 7, 7, 3], 6),
+                         [6.0, 4.0, 4.0, 4.0, 2.0])
+        self.assertEqual(_assign_rank_points([], 4), [])
+
+    def test_what_if_copies_only_overridden_rows(self):
+        """what_if should leave the base stats untouched."""
+        base = self.ld.team_stats
+        out = self.calc.what_if(base, {'team.1': {'12': 1}})
+        self.assertEqual(out['team.1']['12'], 1)
+        self.assertEqual(base['team.1']['12'], 5000)
+        self.assertIs(out['team.2'], base['team.2'])
+
     def test_standings_table_sorted_by_roto_score(self):
         """Standings table should be sorted by total Roto score descending."""
         table = self.calc.get_roto_standings_table()
-        scores = [entry['roto_score'] for entry in table]
+        scores = list(table['roto_score'])
         self.assertEqual(scores, sorted(scores, reverse=True))
 
+    def test_standings_table_columns(self):
+        """Standings table should hold Roto score then points per category."""
+        table = self.calc.get_roto_standings_table()
+        self.assertEqual(table.index.name, 'team_key')
+        self.assertEqual(list(table.columns),
+                         ['team_name', 'roto_score',
+                          '12', '15', '16', '17', '18', '19'])
+        self.assertEqual(table.loc['team.2', 'team_name'], 'Team Beta')
+        # TO: lowest (team.2 = Team Beta) earns the most points
+        self.assertEqual(table.loc['team.2', '19'], 4)
+
     def test_standings_gaps_structure(self):
         """get_standings_gaps should return correct structure for each stat."""
         gaps = self.calc.get_standings_gaps('team.1')
@@ -161,6 +335,26 @@ class TestRotoCalculator(unittest.TestCase):
             self.assertIn('to_lose_rank', gap)
             self.assertIn('rank_points', gap)
 
+    def test_standings_gaps_cached_with_baseline(self):
+        """Gaps should be reused until the baseline standings change."""
+        first = self.calc.get_standings_gaps('team.1')
+        self.assertIs(self.calc.get_standings_gaps('team.1'), first)
+
+        self.ld.team_stats['team.1']['12'] = 9999
+        self.calc.invalidate_cache()
+        gaps = self.calc.get_standings_gaps('team.1')
+        self.assertIsNot(gaps, first)
+        self.assertEqual(gaps['12']['current_rank'], 1)
+
+    def test_team_positions_match_rankings(self):
+        """team_positions should index each team's row in rankings."""
+        result = self.calc.calculate_standings()
+        for stat_id, ranked in result['rankings'].items():
+            positions = result['team_positions'][stat_id]
+            self.assertEqual(len(positions), len(ranked))
+            for tk, idx in positions.items():
+                self.assertEqual(ranked[idx][0], tk)
+
     def test_best_team_has_no_gain_opportunity(self):
         """The #1 ranked team in a category should have to_gain_rank=None."""
         gaps = self.calc.get_standings_gaps('team.3')
@@ -200,8 +394,25 @@ class TestRotoCalculator(unittest.TestCase):
 class TestTradeSimulator(unittest.TestCase):
     """Test the TradeSimulator class."""
 
+    # Tests that modify the league data get a private copy
+    MUTATING_TESTS = {
+        'test_project_player_ros',
+        'test_invalidate_baseline',
+        'test_replaced_team_stats_discards_scored_trades',
+        'test_projections_follow_player_stats_and_remaining_games',
+        'test_trade_scores_shared_across_perspectives',
+        'test_percentages_rebuilt_from_projected_components',
+        'test_untouched_stats_keep_baseline_values',
+    }
+
+    @classmethod
+    def setUpClass(cls):
+        cls._template_ld = MockLeagueData()
+
     def setUp(self):
-        self.ld = MockLeagueData()
+        self.ld = self._template_ld
+        if self._testMethodName in self.MUTATING_TESTS:
+            self.ld = copy.deepcopy(self.ld)
         from trade_simulator import TradeSimulator
         self.sim = TradeSimulator(self.ld, remaining_games=30)
 
@@ -214,6 +425,124 @@ class TestTradeSimulator(unittest.TestCase):
         self.assertAlmostEqual(proj['12'], 25.0 / 50.0 * 30)
         # p1: REB total=10.0, GP=50 → avg=0.2, ROS = 0.2 * 30 = 6.0
         self.assertAlmostEqual(proj['15'], 10.0 / 50.0 * 30)
+        # Projected from the current stats on every call
+        self.ld.player_stats['p1']['0'] = 25.0
+        self.assertAlmostEqual(self.sim.project_player_ros('p1')['12'],
+                               25.0 / 25.0 * 30)
+
+    def test_projections_precomputed(self):
+        """Cached ROS projections should match a live projection."""
+        for pkey in self.ld.player_stats:
+            live = self.sim.project_player_ros(pkey)
+            self.assertEqual(self.sim._ros_rows[pkey],
+                             tuple(live.get(sid, 0) for sid in self.ld.roto_stat_ids))
+        self.assertEqual(self.sim._component_rows['p1'], ())
+
+    def test_percentages_rebuilt_from_projected_components(self):
+        """FG% after a trade uses per-game component projections."""
+        from trade_simulator import TradeSimulator
+        self.ld.roto_stat_ids = self.ld.roto_stat_ids + ['5']
+        for tk, (made, att) in zip(self.ld.team_stats, [(1800, 4000), (1700, 4000),
+                                                        (1900, 4000), (1600, 4000)]):
+            self.ld.team_stats[tk].update({'3': made, '4': att, '5': made / att})
+        self.ld.player_stats['p1'].update({'0': 50.0, '3': 500.0, '4': 1000.0})
+        self.ld.player_stats['p3'].update({'0': 50.0, '3': 250.0, '4': 1000.0})
+        sim = TradeSimulator(self.ld, remaining_games=30)
+        self.assertEqual(sim._component_rows['p1'], (300.0, 600.0))
+
+        # Over 30 games p1 projects to 300/600 and p3 to 150/600, so the
+        # trade moves team.1 to 1650/4000 and team.2 to 1850/4000
+        scored = sim._score_trade(['p1'], ['p3'], 'team.1', 'team.2')
+        expected = {tk: dict(row) for tk, row in self.ld.team_stats.items()}
+        for tk, made in (('team.1', 1650), ('team.2', 1850)):
+            expected[tk].update({'3': made, '5': made / 4000})
+        net = [sim._ros_rows['p3'][i] - sim._ros_rows['p1'][i]
+               for i in range(len(sim._counting_stat_ids))]
+        for i, sid in enumerate(sim._counting_stat_ids):
+            expected['team.1'][sid] += net[i]
+            expected['team.2'][sid] -= net[i]
+        full = sim.calculator.calculate_standings(expected)['roto_scores']
+        base = sim.calculator.calculate_standings()['roto_scores']
+        self.assertAlmostEqual(scored[0], full['team.1'] - base['team.1'])
+        self.assertAlmostEqual(scored[1], full['team.2'] - base['team.2'])
+
+    def test_untouched_stats_keep_baseline_values(self):
+        """Stats no traded player contributes to are left as they were."""
+        from trade_simulator import TradeSimulator
+        self.ld.roto_stat_ids = self.ld.roto_stat_ids + ['5']
+        # Reported FG% differs from FGM/FGA; no one traded shoots
+        for tk in self.ld.team_stats:
+            self.ld.team_stats[tk].update({'3': 1800, '4': 4000, '5': 0.4})
+        self.ld.team_stats['team.2']['5'] = 0.5
+        for pkey in ('p1', 'p3'):
+            self.ld.player_stats[pkey]['0'] = 50.0
+        self.ld.player_stats['p1']['18'] = self.ld.player_stats['p3']['18']
+        sim = TradeSimulator(self.ld, remaining_games=30)
+        captured = {}
+        original = sim.calculator.could_change_ranks
+
+        def capture(changed):
+            captured.update(changed)
+            return original(changed)
+
+        sim.calculator.could_change_ranks = capture
+        sim._score_trade(['p1'], ['p3'], 'team.1', 'team.2')
+        for tk in ('team.1', 'team.2'):
+            for sid in ('5', '18'):
+                self.assertEqual(captured[tk][sid], self.ld.team_stats[tk][sid])
+
+    def test_invalidate_baseline(self):
+        """In-place changes are picked up after invalidate_baseline()."""
+        self.sim.simulate_trade(['p1'], ['p3'], 'team.1', 'team.2')
+        self.ld.team_stats['team.1']['12'] += 1000.0
+        self.ld.player_stats['p1']['0'] = 50.0
+        self.sim.invalidate_baseline()
+        fresh = self.sim.simulate_trade(['p1'], ['p3'], 'team.1', 'team.2')
+        expected = self.sim.calculator.calculate_standings(dict(self.ld.team_stats))
+        self.assertEqual(fresh['my_old_score'], expected['roto_scores']['team.1'])
+        self.assertAlmostEqual(self.sim._ros_rows['p1'][0], 25.0 / 50.0 * 30)
+
+    def test_replaced_team_stats_discards_scored_trades(self):
+        """Assigning a new ld.team_stats dict rescores cached trades."""
+        from trade_simulator import TradeSimulator
+        for pkey in ('p1', 'p3'):
+            self.ld.player_stats[pkey]['0'] = 50.0
+        sim = TradeSimulator(self.ld)
+        before = sim.simulate_trade(['p1'], ['p3'], 'team.1', 'team.2')
+        # Close the PTS gap so the projected swing now passes team.2
+        team_stats = copy.deepcopy(self.ld.team_stats)
+        team_stats['team.2']['12'] = 4999
+        self.ld.team_stats = team_stats
+        result = sim.simulate_trade(['p1'], ['p3'], 'team.1', 'team.2')
+        expected = TradeSimulator(self.ld).simulate_trade(
+            ['p1'], ['p3'], 'team.1', 'team.2')
+        self.assertNotEqual(expected['my_delta'], before['my_delta'])
+        self.assertEqual(result, expected)
+
+    def test_projections_follow_player_stats_and_remaining_games(self):
+        """A new ld.player_stats or remaining_games re-projects players."""
+        from trade_simulator import TradeSimulator
+        for pkey in ('p1', 'p3'):
+            self.ld.player_stats[pkey]['0'] = 50.0
+        sim = TradeSimulator(self.ld)
+        sim.simulate_trade(['p1'], ['p3'], 'team.1', 'team.2')
+
+        sim.remaining_games = 60
+        self.assertAlmostEqual(sim._ros_rows['p1'][0], 25.0 / 50.0 * 60)
+        self.assertEqual(
+            sim.simulate_trade(['p1'], ['p3'], 'team.1', 'team.2'),
+            TradeSimulator(self.ld, remaining_games=60).simulate_trade(
+                ['p1'], ['p3'], 'team.1', 'team.2'))
+
+        player_stats = copy.deepcopy(self.ld.player_stats)
+        player_stats['p1']['12'] = 250.0
+        self.ld.player_stats = player_stats
+        self.assertAlmostEqual(sim.project_player_ros('p1')['12'],
+                               250.0 / 50.0 * 60)
+        self.assertEqual(
+            sim.simulate_trade(['p1'], ['p3'], 'team.1', 'team.2'),
+            TradeSimulator(self.ld, remaining_games=60).simulate_trade(
+                ['p1'], ['p3'], 'team.1', 'team.2'))
 
     def test_simulate_trade_returns_correct_keys(self):
         """Trade simulation result should contain all expected keys."""
@@ -263,6 +592,39 @@ class TestTradeSimulator(unittest.TestCase):
                     # a must be mutually beneficial if b is not
                     self.assertTrue(a['mutually_beneficial'])
 
+    def test_find_best_trades_keeps_top_k_order(self):
+        """Top-K selection should match a full stable sort."""
+        deltas = iter([1.0, 3.0, 2.0, 3.0, 0.5, 4.0, 2.0, 1.5,
+                       0.0, -1.0, 1.0, 2.5])
+
+        def fake_score(my_players, their_players, my_tk, their_tk,
+                       require_gain=False):
+            delta = next(deltas)
+            return delta, delta - 2.5
+
+        self.sim._score_trade = fake_score
+        trades = self.sim.find_best_trades('team.1', max_results=3)
+        self.assertEqual([t['my_delta'] for t in trades], [4.0, 3.0, 3.0])
+        self.assertTrue(trades[0]['mutually_beneficial'])
+        self.assertEqual(trades[1]['my_players_traded'], ['Player One'])
+        self.assertEqual(trades[1]['their_players_traded'], ['Player Four'])
+        self.assertEqual(trades[2]['my_players_traded'], ['Player Two'])
+        self.assertEqual(trades[2]['their_players_traded'], ['Player Four'])
+        self.assertEqual(trades[2]['opponent_team_key'], 'team.2')
+
+    def test_trade_scores_shared_across_perspectives(self):
+        """A trade scored for one team is reused from the other side."""
+        from trade_simulator import TradeSimulator
+        for stats in self.ld.player_stats.values():
+            stats['0'] = 50.0
+        self.sim = TradeSimulator(self.ld, remaining_games=30)
+        self.sim.find_best_trades('team.1', max_results=20)
+        cached = len(self.sim._trade_cache)
+        self.assertGreater(cached, 0)
+        mirrored = self.sim.find_best_trades('team.2', max_results=20)
+        fresh = TradeSimulator(self.ld, remaining_games=30)
+        self.assertEqual(mirrored, fresh.find_best_trades('team.2', max_results=20))
+
     def test_find_best_trades_max_results(self):
         """Should not return more results than max_results."""
         trades = self.sim.find_best_trades('team.1', max_results=2)
@@ -275,37 +637,35 @@ class TestShowRostersHelpers(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
         """Mock yahoo_oauth and yahoo_fantasy_api so show_rosters can be imported."""
-        import types
-        cls._mock_modules = {}
-        for mod_name in ['yahoo_oauth', 'yahoo_fantasy_api', 'yahoo_fantasy_api.league',
-                         'yahoo_fantasy_api.game', 'yahoo_fantasy_api.team', 'dotenv',
-                         'objectpath']:
-            if mod_name not in sys.modules:
-                cls._mock_modules[mod_name] = sys.modules.get(mod_name)
-                sys.modules[mod_name] = types.ModuleType(mod_name)
-
-        # Add required attributes
-        sys.modules['yahoo_oauth'].OAuth2 = MagicMock
-        sys.modules['dotenv'].load_dotenv = lambda: None
-        sys.modules['objectpath'].Tree = MagicMock
+        cls._mock_modules = _install_yahoo_mocks()
 
     @classmethod
     def tearDownClass(cls):
-        for mod_name, original in cls._mock_modules.items():
-            if original is None:
-                sys.modules.pop(mod_name, None)
-            else:
-                sys.modules[mod_name] = original
-
-    def test_build_stat_id_map(self):
-        from show_rosters import build_stat_id_map
+        _restore_modules(cls._mock_modules)
+
+    def test_parse_stat_categories(self):
+        from show_rosters import parse_stat_categories
         categories = [
-            {'stat_id': '12', 'display_name': 'PTS'},
-            {'stat_id': '15', 'display_name': 'REB'},
+            {'stat_id': 5, 'display_name': 'FG%'},
+            {'stat_id': 12, 'display_name': 'Points'},
+            {'stat_id': 3, 'display_name': 'FGM',
+             'is_only_display_stat': '1'},
         ]
-        result = build_stat_id_map(categories)
-        self.assertEqual(result['12'], 'PTS')
-        self.assertEqual(result['15'], 'REB')
+        stat_id_map, reverse_map, roto_stat_ids = parse_stat_categories(
+            categories)
+        self.assertEqual(stat_id_map, {'5': 'FG%', '12': 'Points', '3': 'FGM'})
+        self.assertEqual(roto_stat_ids, ['5', '12'])
+        # API names first, then defaults for names the API didn't use
+        self.assertEqual(reverse_map['Points'], '12')
+        self.assertEqual(reverse_map['PTS'], '12')
+        self.assertEqual(reverse_map['FGA'], '4')
+        self.assertEqual(reverse_map['GP'], '0')
+
+    def test_parse_stat_categories_defaults_roto_ids(self):
+        from show_rosters import ROTO_STAT_NAMES, parse_stat_categories
+        _, _, roto_stat_ids = parse_stat_categories(
+            [{'stat_id': 3, 'display_name': 'FGM', 'is_only_display_stat': 1}])
+        self.assertEqual(roto_stat_ids, list(ROTO_STAT_NAMES))
 
     def test_format_stat_value_percentage(self):
         from show_rosters import format_stat_value
@@ -320,6 +680,86 @@ class TestShowRostersHelpers(unittest.TestCase):
         from show_rosters import format_stat_value
         self.assertEqual(format_stat_value('12', 10.5), '10.5')
 
+    def test_format_stat_value_non_numeric(self):
+        from show_rosters import format_stat_value
+        self.assertEqual(format_stat_value('5', '-'), '-')
+        self.assertEqual(format_stat_value('0', 12), '12')
+
+    def test_extract_player_stats(self):
+        from show_rosters import extract_player_stats
+        reverse_stat_map = {'PTS': '12', 'GP': '0', 'FG%': '5'}
+        player_info = {101: {'name': 'Player A'}, 102: {'name': 'Player B'}}
+        response = [
+            {'player_id': 101, 'name': 'Player A', 'PTS': 500.0, 'GP': 20,
+             'FG%': '-', 'position_type': 'P'},
+            {'player_id': 999, 'name': 'Player B', 'PTS': 300.0},
+            {'player_id': '', 'name': 'Nobody', 'PTS': 1.0},
+        ]
+        result = extract_player_stats(response, reverse_stat_map, player_info)
+        self.assertEqual(result, {101: {'12': 500.0, '0': 20},
+                                  102: {'12': 300.0}})
+
+    def test_select_player_stats(self):
+        from show_rosters import select_player_stats
+        player_info = {101: {'name': 'Player A'}, 102: {'name': 'Player B'}}
+        response = [
+            {'player_id': 101, 'name': 'Player A', '12': 500.0, '0': 20,
+             '5': '-', '99': 1.0, 'position_type': 'P'},
+            {'player_id': 999, 'name': 'Player B', '12': 300.0},
+        ]
+        result = select_player_stats(response, ['12', '0', '5'], player_info)
+        self.assertEqual(result, {101: {'12': 500.0, '0': 20.0},
+                                  102: {'12': 300.0}})
+
+    def test_as_float(self):
+        from show_rosters import _as_float
+        self.assertEqual(_as_float(20), 20.0)
+        self.assertEqual(_as_float('0.455'), 0.455)
+        for value in (None, '-', '', 'N/A', {}):
+            self.assertIsNone(_as_float(value))
+
+    def test_sum_stat_columns(self):
+        from show_rosters import stat_columns, sum_stat_columns
+        rows = [{'12': 500.0, '3': 200}, {'12': 250.5}, {}]
+        columns = stat_columns(rows, ['12', '3', '15'])
+        self.assertEqual(columns['3'], [200, None, None])
+        self.assertEqual(sum_stat_columns(columns, ['12', '3', '15']),
+                         {'12': 750.5, '3': 200})
+
+    def test_render_team_table_totals(self):
+        from show_rosters import build_table_layout, render_team_table
+        layout = build_table_layout(['5', '12'], {'5': 'FG%', '12': 'PTS'})
+        stats = {1: {'0': 10.0, '3': 40.0, '4': 80.0, '5': 0.5, '12': 100.0},
+                 2: {'0': 5.0, '3': 10.0, '4': 40.0, '5': 0.25}}
+        info = {1: {'name': 'A', 'position': 'PG', 'team': 'BOS'},
+                2: {'name': 'B', 'position': 'C', 'team': 'LAL'}}
+        lines = render_team_table([1, 2], info, stats, layout)
+        self.assertEqual(len(lines), 7)
+        self.assertEqual(lines[3].split()[-2:], ['0.250', '—'])
+        self.assertEqual(lines[5].split()[-2:], ['0.417', '100'])
+        self.assertIn('Team GP: 15', lines[6])
+        self.assertIn('FGM/FGA: 50/120', lines[6])
+
+    def test_fetch_rosters_batched(self):
+        from show_rosters import fetch_rosters
+        client = MagicMock()
+        client.get_all_rosters.return_value = {'t.1': [{'player_id': 1}]}
+        rosters, errors = fetch_rosters(client, ['t.1', 't.2'])
+        self.assertEqual(rosters, {'t.1': [{'player_id': 1}]})
+        self.assertEqual(list(errors), ['t.2'])
+        client.get_team_roster.assert_not_called()
+
+    def test_fetch_rosters_falls_back_per_team(self):
+        from show_rosters import fetch_rosters
+        client = MagicMock()
+        client.get_all_rosters.side_effect = RuntimeError('boom')
+        client.get_team_roster.side_effect = lambda tk: [{'player_id': tk}]
+        with patch('builtins.print'):
+            rosters, errors = fetch_rosters(client, ['t.1', 't.2'])
+        self.assertEqual(rosters, {'t.1': [{'player_id': 't.1'}],
+                                   't.2': [{'player_id': 't.2'}]})
+        self.assertEqual(errors, {})
+
 
 class TestLeagueDataExtractStats(unittest.TestCase):
     """Test LeagueData._extract_stats and _compute_team_stats."""
@@ -327,26 +767,11 @@ class TestLeagueDataExtractStats(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
         """Mock external modules so league_data can be imported."""
-        import types
-        cls._mock_modules = {}
-        for mod_name in ['yahoo_oauth', 'yahoo_fantasy_api', 'yahoo_fantasy_api.league',
-                         'yahoo_fantasy_api.game', 'yahoo_fantasy_api.team', 'dotenv',
-                         'objectpath']:
-            if mod_name not in sys.modules:
-                cls._mock_modules[mod_name] = sys.modules.get(mod_name)
-                sys.modules[mod_name] = types.ModuleType(mod_name)
-
-        sys.modules['yahoo_oauth'].OAuth2 = MagicMock
-        sys.modules['dotenv'].load_dotenv = lambda: None
-        sys.modules['objectpath'].Tree = MagicMock
+        cls._mock_modules = _install_yahoo_mocks()
 
     @classmethod
     def tearDownClass(cls):
-        for mod_name, original in cls._mock_modules.items():
-            if original is None:
-                sys.modules.pop(mod_name, None)
-            else:
-                sys.modules[mod_name] = original
+        _restore_modules(cls._mock_modules)
 
     def _make_ld(self):
         """Create a LeagueData-like object with reverse_stat_map set."""
@@ -358,6 +783,7 @@ class TestLeagueDataExtractStats(unittest.TestCase):
         ld.negative_stats = set()
         ld.teams = {'team.1': 'Team A'}
         ld.rosters = {'team.1': [{'player_id': 101}, {'player_id': 102}]}
+        ld._roster_keys = {}
         ld.player_stats = {
             101: {'0': 50.0, '3': 200.0, '4': 400.0, '5': 0.500,
                   '12': 500.0, '15': 300.0, '17': 50.0},
@@ -372,33 +798,19 @@ class TestLeagueDataExtractStats(unittest.TestCase):
         }
         return ld
 
-    def test_flat_format_extraction(self):
+    def test_normalized_row_extraction(self):
         ld = self._make_ld()
         player_data = {
             'player_id': 123,
             'name': 'Test Player',
-            'PTS': 25.0,
-            'REB': 10.0,
-            'ST': 2.0,
-            'GP': 50.0,
+            'position_type': 'P',
+            '12': 25.0,
+            '15': 10.0,
+            '5': '-',
+            '0': 50.0,
         }
         stats = ld._extract_stats(player_data)
-        self.assertAlmostEqual(stats['12'], 25.0)
-        self.assertAlmostEqual(stats['15'], 10.0)
-        self.assertAlmostEqual(stats['17'], 2.0)
-        self.assertAlmostEqual(stats['0'], 50.0)
-
-    def test_nested_format_still_works(self):
-        ld = self._make_ld()
-        player_data = {
-            'player_stats': {
-                'stats': [
-                    {'stat_id': '12', 'value': '30.0'},
-                ]
-            }
-        }
-        stats = ld._extract_stats(player_data)
-        self.assertAlmostEqual(stats['12'], 30.0)
+        self.assertEqual(stats, {'12': 25.0, '15': 10.0, '0': 50.0})
 
     def test_get_active_player_keys_excludes_il(self):
         """get_active_player_keys should exclude IL/IL+ players."""
@@ -418,6 +830,546 @@ class TestLeagueDataExtractStats(unittest.TestCase):
         active = ld.get_active_player_keys('team.1')
         self.assertEqual(len(active), 2)
 
+    def test_player_keys_cached_per_roster(self):
+        """Roster keys are parsed once and refreshed when a roster is replaced."""
+        ld = self._make_ld()
+        keys = ld.get_team_player_keys('team.1')
+        self.assertEqual(keys, [101, 102])
+        self.assertIs(ld.get_team_player_keys('team.1'), keys)
+        ld.rosters = {'team.1': [{'player_id': 103, 'selected_position': 'IL'}]}
+        self.assertEqual(ld.get_team_player_keys('team.1'), [103])
+        self.assertEqual(ld.get_active_player_keys('team.1'), [])
+
+    def test_fetch_rosters_keeps_team_order_and_skips_failures(self):
+        """fetch_rosters should tolerate per-team errors."""
+        ld = self._make_ld()
+        ld.teams = {'team.1': 'Team A', 'team.2': 'Team B', 'team.3': 'Team C'}
+
+        def get_team_roster(team_key):
+            if team_key == 'team.2':
+                raise RuntimeError('boom')
+            return [{'player_id': team_key + '.p', 'name': 'P',
+                     'selected_position': 'PG'}]
+
+        ld.client = MagicMock()
+        ld.client.get_all_rosters.side_effect = RuntimeError('batch failed')
+        ld.client.get_team_roster.side_effect = get_team_roster
+        ld.fetch_rosters()
+        self.assertEqual(list(ld.rosters), ['team.1', 'team.2', 'team.3'])
+        self.assertEqual(ld.rosters['team.2'], [])
+        self.assertEqual(ld.player_info['team.3.p']['team_key'], 'team.3')
+
+    def test_fetch_all_populates_settings_and_standings(self):
+        """fetch_all should run settings and standings before rosters."""
+        ld = self._make_ld()
+        ld.client = MagicMock()
+        ld.client.get_stat_categories_raw.return_value = [
+            {'stat_id': 12, 'display_name': 'PTS'}]
+        ld.client.get_standings.return_value = [
+            {'team_key': 'team.1', 'name': 'Team A'}]
+        ld.client.get_all_teams_stats.return_value = {'team.1': {'12': 1.0}}
+        ld.client.get_all_rosters.return_value = {'team.1': []}
+        ld.save_cache = MagicMock()
+        ld.fetch_all(refresh=True)
+        ld.save_cache.assert_called_once_with()
+        self.assertEqual(ld.roto_stat_ids, ['12'])
+        self.assertEqual(ld.teams, {'team.1': 'Team A'})
+        ld.client.get_all_rosters.assert_called_once_with(['team.1'])
+
+    def test_cache_round_trip_keeps_int_player_keys(self):
+        """save_cache/load_cache should restore the fetched data."""
+        import tempfile
+        import cache
+        ld = self._make_ld()
+        ld.client = MagicMock(league_id='1')
+        ld.teams = {'team.1': 'Team A'}
+        ld.team_stats = {'team.1': {'12': 800.0}}
+        ld.standings_raw = []
+        ld._stat_names = {'12': 'PTS'}
+        orig_dir = cache.CACHE_DIR
+        with tempfile.TemporaryDirectory() as tmp:
+            cache.CACHE_DIR = tmp
+            try:
+                ld.save_cache()
+                loaded = self._make_ld()
+                loaded.client = ld.client
+                self.assertTrue(loaded.load_cache())
+            finally:
+                cache.CACHE_DIR = orig_dir
+        self.assertEqual(loaded.player_stats, ld.player_stats)
+        self.assertIn(101, loaded.player_stats)
+        self.assertEqual(loaded.player_info, ld.player_info)
+        self.assertEqual(loaded.negative_stats, ld.negative_stats)
+        self.assertEqual(loaded.team_stats, ld.team_stats)
+
+    def test_fetch_rosters_uses_single_batched_request(self):
+        """fetch_rosters should fetch every roster in one call."""
+        ld = self._make_ld()
+        ld.teams = {'team.1': 'Team A', 'team.2': 'Team B'}
+        ld.client = MagicMock()
+        ld.client.get_all_rosters.return_value = {
+            'team.1': [{'player_id': 1, 'name': 'P1',
+                        'selected_position': 'PG'}],
+        }
+        ld.fetch_rosters()
+        ld.client.get_all_rosters.assert_called_once_with(['team.1', 'team.2'])
+        ld.client.get_team_roster.assert_not_called()
+        self.assertEqual(ld.rosters['team.2'], [])
+        self.assertEqual(ld.player_info[1]['position'], 'PG')
+
+    def test_fetch_player_stats_requests_all_teams_at_once(self):
+        """fetch_player_stats should request every team's players in one call."""
+        ld = self._make_ld()
+        ld.teams = {'team.1': 'Team A', 'team.2': 'Team B'}
+        ld.rosters = {
+            'team.1': [{'player_id': i} for i in range(1, 16)],
+            'team.2': [{'player_id': i} for i in range(16, 31)],
+        }
+        calls = []
+
+        def get_players_stats_all(keys, req_type, on_error=None):
+            calls.append(list(keys))
+            on_error(2, 2, RuntimeError('boom'))
+            return [{'player_id': k, '12': float(k)} for k in keys]
+
+        ld.client = MagicMock()
+        ld.client.get_players_stats_all.side_effect = get_players_stats_all
+        with patch('builtins.print') as mock_print:
+            ld.fetch_player_stats()
+        self.assertEqual(calls, [list(range(1, 31))])
+        self.assertIn('batch 2 of 2', mock_print.call_args[0][0])
+        self.assertEqual(len(ld.player_stats), 30)
+        self.assertEqual(ld.player_stats[30], {'12': 30.0})
+
+
+class TestClientParsing(unittest.TestCase):
+    """Test the raw-response parsers on FantasyBasketballClient."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Mock external modules so client can be imported."""
+        cls._mock_modules = _install_yahoo_mocks()
+
+    @classmethod
+    def tearDownClass(cls):
+        _restore_modules(cls._mock_modules)
+
+    @staticmethod
+    def _player(player_id, name, stats):
+        return {'player': [
+            [{'player_key': f'466.p.{player_id}'},
+             {'player_id': str(player_id)},
+             {'name': {'full': name, 'first': name.split()[0]}},
+             [],
+             {'position_type': 'P'}],
+            {'player_stats': {
+                '0': {'coverage_type': 'season'},
+                'stats': [{'stat': {'stat_id': sid, 'value': val}}
+                          for sid, val in stats],
+            }},
+        ]}
+
+    def test_get_all_free_agents_dedupes_across_positions(self):
+        from client import FantasyBasketballClient
+        by_pos = {'PG': [{'player_id': 1}, {'player_id': 2}],
+                  'SG': [{'player_id': 2}, {'player_id': 3}]}
+        client = FantasyBasketballClient.__new__(FantasyBasketballClient)
+        client.lg = MagicMock()
+        client.lg.free_agents.side_effect = lambda pos: by_pos.get(pos, [])
+        players = client.get_all_free_agents()
+        self.assertEqual([p['player_id'] for p in players], [1, 2, 3])
+        self.assertEqual(client.lg.free_agents.call_count, 5)
+
+    def test_get_players_stats_all_batches(self):
+        """Keys are fetched in batches of 25; failures skip or raise."""
+        from client import FantasyBasketballClient
+        client = FantasyBasketballClient.__new__(FantasyBasketballClient)
+        client.lg = MagicMock()
+
+        def get_player_stats_raw(league_id, batch, *args):
+            if 60 in batch:
+                raise RuntimeError('boom')
+            return batch
+
+        client.lg.yhandler.get_player_stats_raw.side_effect = get_player_stats_raw
+        rows = lambda raw: [{'player_id': k} for k in raw]
+        errors = []
+        with patch.object(FantasyBasketballClient, '_parse_player_stats_raw',
+                          side_effect=rows):
+            result = client.get_players_stats_all(
+                list(range(1, 61)), on_error=lambda *e: errors.append(e[:2]))
+            self.assertEqual([r['player_id'] for r in result], list(range(1, 51)))
+            self.assertEqual(errors, [(3, 3)])
+            self.assertEqual(client.lg.yhandler.get_player_stats_raw.call_count, 3)
+            with self.assertRaises(RuntimeError):
+                client.get_players_stats_all(list(range(1, 61)))
+
+    def test_get_teams_cached_on_disk(self):
+        import tempfile
+        import cache
+        from client import FantasyBasketballClient
+        orig_dir = cache.CACHE_DIR
+        with tempfile.TemporaryDirectory() as tmp:
+            cache.CACHE_DIR = tmp
+            try:
+                teams = {'466.l.1.t.1': {'name': 'Team Alpha'}}
+                for _ in range(2):
+                    client = FantasyBasketballClient.__new__(
+                        FantasyBasketballClient)
+                    client.league_key = '466.l.1'
+                    client.lg = MagicMock()
+                    client.lg.teams.return_value = teams
+                    self.assertEqual(client.get_teams(), teams)
+                # The second client was served from disk
+                client.lg.teams.assert_not_called()
+            finally:
+                cache.CACHE_DIR = orig_dir
+
+    def test_refresh_bypasses_disk_cache(self):
+        """A refreshing client re-fetches, and its result is cached again."""
+        import tempfile
+        import cache
+        from client import FantasyBasketballClient
+        orig_dir = cache.CACHE_DIR
+        with tempfile.TemporaryDirectory() as tmp:
+            cache.CACHE_DIR = tmp
+            try:
+                for refresh, name in ((False, 'Old'), (True, 'New'),
+                                      (False, 'Unused')):
+                    client = FantasyBasketballClient.__new__(
+                        FantasyBasketballClient)
+                    client.refresh = refresh
+                    client.league_key = '466.l.1'
+                    client.lg = MagicMock()
+                    client.lg.teams.return_value = {'466.l.1.t.1': {'name': name}}
+                    teams = client.get_teams()
+                self.assertEqual(teams, {'466.l.1.t.1': {'name': 'New'}})
+                client.lg.teams.assert_not_called()
+            finally:
+                cache.CACHE_DIR = orig_dir
+
+    def test_get_standings_cached_on_disk(self):
+        import tempfile
+        import cache
+        from client import FantasyBasketballClient
+        orig_dir = cache.CACHE_DIR
+        with tempfile.TemporaryDirectory() as tmp:
+            cache.CACHE_DIR = tmp
+            try:
+                standings = [{'team_key': '466.l.1.t.1', 'name': 'Team Alpha'}]
+                for _ in range(2):
+                    client = FantasyBasketballClient.__new__(
+                        FantasyBasketballClient)
+                    client.league_key = '466.l.1'
+                    client.lg = MagicMock()
+                    client.lg.standings.return_value = standings
+                    self.assertEqual(client.get_standings(), standings)
+                client.lg.standings.assert_not_called()
+            finally:
+                cache.CACHE_DIR = orig_dir
+
+    def test_get_raw_decodes_response_body(self):
+        from client import FantasyBasketballClient
+        client = FantasyBasketballClient.__new__(FantasyBasketballClient)
+        client.oauth = MagicMock()
+        response = client.oauth.session.get.return_value
+        response.status_code = 200
+        response.content = b'{"fantasy_content": {"league": []}}'
+        self.assertEqual(client._get_raw('league/466.l.1/settings'),
+                         {'fantasy_content': {'league': []}})
+        url = client.oauth.session.get.call_args[0][0]
+        self.assertTrue(url.endswith('/league/466.l.1/settings'))
+
+        response.status_code = 401
+        with self.assertRaises(RuntimeError):
+            client._get_raw('league/466.l.1/settings')
+
+    def test_parse_teams_stats_raw(self):
+        from client import FantasyBasketballClient
+        raw = {'fantasy_content': {'league': [
+            {'league_key': '466.l.1'},
+            {'teams': {
+                '0': {'team': [
+                    [{'team_key': '466.l.1.t.1'}, {'team_id': '1'}],
+                    {'team_stats': {'coverage_type': 'season', 'stats': [
+                        {'stat': {'stat_id': '12', 'value': '5000'}},
+                        {'stat': {'stat_id': '5', 'value': '.475'}},
+                        {'stat': {'stat_id': '9004003', 'value': '-'}},
+                    ]}},
+                ]},
+                'count': 1,
+            }},
+        ]}}
+        result = FantasyBasketballClient._parse_teams_stats_raw(raw)
+        self.assertEqual(result, {'466.l.1.t.1': {'12': 5000.0, '5': 0.475}})
+
+    def test_parse_rosters_raw(self):
+        from client import FantasyBasketballClient
+        raw = {'fantasy_content': {'teams': {
+            '0': {'team': [
+                [{'team_key': '466.l.1.t.1'}, {'team_id': '1'}],
+                {'roster': {'0': {'players': {
+                    '0': {'player': [
+                        [{'player_key': '466.p.101'},
+                         {'player_id': '101'},
+                         {'name': {'full': 'Player A'}},
+                         {'editorial_team_abbr': 'BOS'},
+                         {'position_type': 'P'},
+                         {'eligible_positions': [{'position': 'PG'},
+                                                 {'position': 'G'}]}],
+                        {'selected_position': [{'coverage_type': 'date'},
+                                               {'position': 'PG'}]},
+                    ]},
+                    'count': 1,
+                }}}},
+            ]},
+            'count': 1,
+        }}}
+        rosters = FantasyBasketballClient._parse_rosters_raw(raw)
+        self.assertEqual(list(rosters), ['466.l.1.t.1'])
+        player = rosters['466.l.1.t.1'][0]
+        self.assertEqual(player['player_id'], 101)
+        self.assertEqual(player['name'], 'Player A')
+        self.assertEqual(player['eligible_positions'], ['PG', 'G'])
+        self.assertEqual(player['selected_position'], 'PG')
+
+    def test_parse_player_stats_raw(self):
+        from client import FantasyBasketballClient
+        raw = {'fantasy_content': {'players': {
+            '0': self._player(101, 'Player A', [('0', '50'), ('12', '500')]),
+            '1': self._player(102, 'Player B', [('0', '40'), ('5', '-')]),
+            'count': 2,
+        }}}
+        rows = FantasyBasketballClient._parse_player_stats_raw(raw)
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0], {'player_id': 101, 'name': 'Player A',
+                                   'position_type': 'P',
+                                   '0': 50.0, '12': 500.0})
+        self.assertEqual(rows[1]['5'], '-')
+
+    def test_parsed_stat_ids_are_interned(self):
+        from client import FantasyBasketballClient
+        raw = {'fantasy_content': {'players': {
+            '0': self._player(101, 'Player A', [(''.join(['1', '2']), '5')]),
+            'count': 1,
+        }}}
+        rows = FantasyBasketballClient._parse_player_stats_raw(raw)
+        sid = next(k for k in rows[0] if k == '12')
+        self.assertIs(sid, sys.intern('12'))
+
+    def test_parse_stat_categories_raw(self):
+        from client import FantasyBasketballClient
+        raw = {'fantasy_content': {'league': [
+            {'league_key': '466.l.1'},
+            {'settings': [{'stat_categories': {'stats': [
+                {'stat': {'stat_id': 5, 'display_name': 'FG%'}},
+                {'stat': {'stat_id': 19, 'display_name': 'TO',
+                          'sort_order': '0'}},
+            ]}}]},
+        ]}}
+        cats = FantasyBasketballClient._parse_stat_categories_raw(raw)
+        self.assertEqual([c['display_name'] for c in cats], ['FG%', 'TO'])
+        self.assertEqual(
+            FantasyBasketballClient._parse_stat_categories_raw({}), [])
+
+
+class TestJsonUtils(unittest.TestCase):
+    """Test the orjson-backed JSON helpers."""
+
+    def test_round_trip(self):
+        import json_utils
+        data = {'teams': {'t.1': {'PTS': 5000.0, 'GP': 50}}, 'ids': ['5', '8']}
+        self.assertEqual(json_utils.loads(json_utils.dumps(data)), data)
+        self.assertEqual(
+            json_utils.loads(json_utils.dumps(data, indent=True)), data)
+
+    def test_default_str_fallback(self):
+        import json_utils
+        from datetime import date
+        out = json_utils.loads(json_utils.dumps({'d': date(2025, 1, 2)}))
+        self.assertEqual(out['d'], '2025-01-02')
+
+
+class TestExportData(unittest.TestCase):
+    """Test export serialization helpers."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Mock external modules so export_data can be imported."""
+        cls._mock_modules = _install_yahoo_mocks()
+
+    @classmethod
+    def tearDownClass(cls):
+        _restore_modules(cls._mock_modules)
+
+    def test_player_entry_encoded_as_object(self):
+        import json_utils
+        from export_data import PlayerEntry
+        entry = PlayerEntry('101', 'Player A', 'PG', 'BOS', 50, 32,
+                            {'PTS': 1000.0}, {'PTS': 20.0})
+        out = json_utils.loads(json_utils.dumps({'roster': [entry]}))
+        self.assertEqual(out['roster'][0]['name'], 'Player A')
+        self.assertEqual(out['roster'][0]['per_game_averages'], {'PTS': 20.0})
+
+
+    def test_build_team_data_per_game_averages(self):
+        from export_data import build_team_data
+        ld = MagicMock()
+        ld.team_stats = {'team.1': {'12': 2000.0, '0': 100.0}}
+        ld.get_team_player_keys.return_value = [1, 2]
+        ld.player_info = {1: {'name': 'A'}, 2: {'name': 'B'}}
+        ld.player_stats = {1: {'0': 50.0, '12': 1000.0, '3': 400.0},
+                           2: {'12': 0.0}}
+        stat_columns = [('12', 'PTS'), ('5', 'FG%')]
+        team = build_team_data(ld, 'team.1', 'Team A', stat_columns,
+                               [('12', 'PTS')])
+        a, b = team['roster']
+        self.assertEqual(a.games_played, 50)
+        self.assertEqual(a.games_left, 32)
+        self.assertEqual(a.per_game_averages, {'PTS': 20.0})
+        self.assertEqual(a.season_totals, {'PTS': 1000.0, 'FGM': 400.0})
+        self.assertEqual(b.games_played, 0)
+        self.assertEqual(b.per_game_averages, {})
+        self.assertEqual(team['team_totals'], {'PTS': 2000.0, 'GP': 100.0})
+
+
+    def test_write_export_gzip_round_trip(self):
+        import gzip
+        import tempfile
+        import json_utils
+        from export_data import write_export
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'out.json.gz')
+            write_export(path, {'league_id': '1'},
+                         [('team.1', {'name': 'A'}), ('team.2', {'name': 'B'})],
+                         indent=False, compress=True)
+            with gzip.open(path, 'rb') as f:
+                data = json_utils.loads(f.read())
+        self.assertEqual(data['metadata'], {'league_id': '1'})
+        self.assertEqual(list(data['teams']), ['team.1', 'team.2'])
+
+
+class TestSuggestTrades(unittest.TestCase):
+    """Test the analysis helpers from suggest_trades.py."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Mock external modules so suggest_trades can be imported."""
+        cls._mock_modules = _install_yahoo_mocks()
+
+    @classmethod
+    def tearDownClass(cls):
+        _restore_modules(cls._mock_modules)
+
+    @staticmethod
+    def _standings():
+        """Five teams; t.1 leads PTS and trails REB, t.5 the reverse."""
+        values = {'t.1': ('500', '10'), 't.2': ('400', '20'),
+                  't.3': ('300', '30'), 't.4': ('200', '40'),
+                  't.5': ('100', '50')}
+        return [
+            {'team_key': tk, 'name': f'Team {tk}',
+             'team_stats': {'stats': [{'stat_id': '12', 'value': pts},
+                                      {'stat_id': '15', 'value': reb}]}}
+            for tk, (pts, reb) in values.items()
+        ]
+
+    def test_analyze_team_strengths(self):
+        from suggest_trades import analyze_team_strengths
+        analysis, rankings = analyze_team_strengths(self._standings(), [])
+        self.assertEqual(analysis['t.1']['strengths'], ['12'])
+        self.assertEqual(analysis['t.1']['weaknesses'], ['15'])
+        self.assertEqual(analysis['t.5']['strengths'], ['15'])
+        self.assertEqual(analysis['t.3']['strengths'], [])
+        self.assertEqual(analysis['t.3']['weaknesses'], [])
+        self.assertEqual([tk for tk, _, _ in rankings['12']],
+                         ['t.1', 't.2', 't.3', 't.4', 't.5'])
+
+    def test_suggest_trade_partners(self):
+        from suggest_trades import (analyze_team_strengths,
+                                    suggest_trade_partners)
+        analysis, _ = analyze_team_strengths(self._standings(), [])
+        suggestions = suggest_trade_partners(analysis, 't.1')
+        self.assertEqual(len(suggestions), 1)
+        self.assertEqual(suggestions[0]['team_b_key'], 't.5')
+        self.assertEqual(suggestions[0]['team_a_gets'], ['15'])
+        self.assertEqual(suggestions[0]['team_b_gets'], ['12'])
+        self.assertEqual(suggestions[0]['synergy_score'], 2)
+
+    def test_suggest_trade_partners_limit_matches_sorted_prefix(self):
+        from suggest_trades import suggest_trade_partners
+        analysis = {
+            f't.{i}': {'name': f'Team {i}',
+                       'strengths': ['12', '15'][:1 + i % 2] if i % 3 else ['19'],
+                       'weaknesses': ['19'] if i % 3 else ['12', '15']}
+            for i in range(1, 10)
+        }
+        full = suggest_trade_partners(analysis)
+        self.assertGreater(len(full), 3)
+        # Each unordered pair is suggested once
+        pairs = [frozenset((s['team_a_key'], s['team_b_key'])) for s in full]
+        self.assertEqual(len(pairs), len(set(pairs)))
+        self.assertEqual(suggest_trade_partners(analysis, limit=3), full[:3])
+
+    def test_build_stat_name_map(self):
+        from suggest_trades import build_stat_name_map
+        name_map = build_stat_name_map([
+            {'stat_id': 12, 'display_name': 'PTS'},
+            {'stat_id': '12', 'display_name': 'Points'},
+            {'stat_id': 15},
+        ])
+        self.assertEqual(name_map, {'12': 'PTS', '15': 'Stat 15'})
+
+
+class TestDiskCache(unittest.TestCase):
+    """Test the on-disk JSON cache decorator."""
+
+    def setUp(self):
+        import tempfile
+        import cache
+        self._tmp = tempfile.TemporaryDirectory()
+        self._orig_dir = cache.CACHE_DIR
+        cache.CACHE_DIR = self._tmp.name
+
+    def tearDown(self):
+        import cache
+        cache.CACHE_DIR = self._orig_dir
+        self._tmp.cleanup()
+
+    def _make_fetcher(self, ttl):
+        from cache import disk_cache
+
+        class Fetcher:
+            calls = 0
+            league_key = '466.l.1'
+
+            @disk_cache(ttl, lambda self: f'x_{self.league_key}.json')
+            def fetch(self):
+                Fetcher.calls += 1
+                return {'calls': Fetcher.calls}
+
+        return Fetcher
+
+    def test_hit_skips_fetch(self):
+        Fetcher = self._make_fetcher(ttl=60)
+        self.assertEqual(Fetcher().fetch(), {'calls': 1})
+        self.assertEqual(Fetcher().fetch(), {'calls': 1})
+        self.assertEqual(Fetcher.calls, 1)
+
+    def test_repeat_call_skips_disk(self):
+        Fetcher = self._make_fetcher(ttl=60)
+        fetcher = Fetcher()
+        fetcher.fetch()
+        with patch('cache.read_cache') as read_cache:
+            self.assertEqual(fetcher.fetch(), {'calls': 1})
+        read_cache.assert_not_called()
+        self.assertEqual(Fetcher.calls, 1)
+
+    def test_expired_entry_refetches(self):
+        Fetcher = self._make_fetcher(ttl=-1)
+        Fetcher().fetch()
+        self.assertEqual(Fetcher().fetch(), {'calls': 2})
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -6,8 +6,16 @@ Handles the nuances of Roto trade analysis:
 - Updates team totals by swapping players
 - Recalculates standings to determine net Roto score changes
 - Properly handles FG% and FT% by tracking component stats (FGM/FGA, FTM/FTA)
+
+Per-trade data is kept in plain tuples and dicts rather than NumPy
+arrays (numpy is available through pandas).  Each candidate touches two
+team rows of roughly ten stats and is re-ranked incrementally, so the
+vectors are tiny and creating arrays for them would cost more than the
+arithmetic it replaces.
 """
-from copy import deepcopy
+import heapq
+from collections import OrderedDict
+from operator import itemgetter
 
 from roto_calculator import RotoCalculator
 
@@ -18,6 +26,56 @@ PERCENTAGE_COMPONENTS = {
     '8': {'made': '6', 'attempted': '7'},   # FT% = FTM / FTA
 }
 
+# Maximum number of scored trades kept for reuse across perspectives
+TRADE_CACHE_SIZE = 100000
+
+# Candidate trade ordering: (mutually_beneficial, my_delta)
+_by_ranking = itemgetter(0, 1)
+
+
+def _column_sums(rows, width):
+    """
+    Column-wise sums of equal-length projection rows.
+
+    Args:
+        rows: Sequence of tuples, or None for players without stats
+        width: Row length, used when there is nothing to sum
+
+    Returns:
+        list: One total per column
+    """
+    rows = [row for row in rows if row is not None]
+    if not rows:
+        return [0] * width
+    if len(rows) == 1:
+        return rows[0]
+    return [sum(col) for col in zip(*rows)]
+
+
+def _project_stats(stats, remaining_games):
+    """
+    Scale a player's season totals to a rest-of-season projection.
+
+    Args:
+        stats: {stat_id: season_total} for one player
+        remaining_games: Estimated remaining games
+
+    Returns:
+        dict: {stat_id: projected_remaining_value}
+    """
+    gp = stats.get('0', 0)  # GP stat_id = '0'
+    projected = {}
+    for stat_id, total_val in stats.items():
+        # For percentage stats, keep as-is (handled via components)
+        if stat_id in PERCENTAGE_COMPONENTS:
+            projected[stat_id] = total_val
+        elif gp > 0:
+            avg = total_val / gp
+            projected[stat_id] = avg * remaining_games
+        else:
+            projected[stat_id] = 0
+    return projected
+
 
 class TradeSimulator:
     """
@@ -30,8 +88,99 @@ class TradeSimulator:
 
     def __init__(self, league_data, remaining_games=30):
         self.ld = league_data
-        self.remaining_games = remaining_games
+        self._remaining_games = remaining_games
         self.calculator = RotoCalculator(league_data)
+        # Roto categories that are plain totals (percentages are rebuilt
+        # from their components), resolved once rather than per trade
+        self._counting_stat_ids = tuple(
+            sid for sid in league_data.roto_stat_ids
+            if sid not in PERCENTAGE_COMPONENTS
+        )
+        # (pct_stat_id, made_id, attempted_id) for percentage categories
+        self._pct_stats = tuple(
+            (sid, PERCENTAGE_COMPONENTS[sid]['made'],
+             PERCENTAGE_COMPONENTS[sid]['attempted'])
+            for sid in league_data.roto_stat_ids
+            if sid in PERCENTAGE_COMPONENTS
+        )
+        # Scored trades keyed on both sides, shared by both teams'
+        # perspectives: {frozenset({(team_key, players), ...}): {team_key: delta}}
+        self._trade_cache = OrderedDict()
+        # League data the cached trades were scored against; replacing
+        # either dict on ld discards them (see _check_sources())
+        self._trade_cache_source = (league_data.team_stats,
+                                    league_data.player_stats)
+        self._project_all()
+
+    def _project_all(self):
+        """
+        Precompute ROS projections for every player with stats.
+
+        All players are projected in one pass instead of twice per
+        candidate trade; the pass is repeated only when ``ld.player_stats``
+        is replaced or ``remaining_games`` is assigned.  Projections
+        of the counting categories are stored column-wise as tuples
+        aligned with ``self._counting_stat_ids`` (``self._ros_rows``), so a
+        trade's net swap is a zip over rows rather than per-stat dict
+        lookups.  The projected made/attempted volumes used to rebuild
+        each percentage category are stored the same way, as
+        (made, attempted) pairs in ``self._pct_stats`` order
+        (``self._component_rows``).
+        """
+        remaining = self.remaining_games
+        self._ros_rows = {}
+        self._component_rows = {}
+        for pkey, stats in self.ld.player_stats.items():
+            projected = _project_stats(stats, remaining)
+            self._ros_rows[pkey] = tuple(
+                projected.get(sid, 0) for sid in self._counting_stat_ids)
+            self._component_rows[pkey] = tuple(
+                projected.get(comp_id, 0)
+                for _, made_id, attempted_id in self._pct_stats
+                for comp_id in (made_id, attempted_id))
+
+    def invalidate_baseline(self):
+        """
+        Discard the cached baseline standings and ROS projections.
+
+        Call after modifying ``ld.team_stats`` or ``ld.player_stats`` in
+        place; every simulate_trade() otherwise reuses the standings and
+        projections computed for the unchanged league.
+        """
+        self.calculator.invalidate_cache()
+        self._trade_cache.clear()
+        self._project_all()
+
+    @property
+    def remaining_games(self):
+        """Estimated remaining games used for every ROS projection."""
+        return self._remaining_games
+
+    @remaining_games.setter
+    def remaining_games(self, value):
+        if value == self._remaining_games:
+            return
+        self._remaining_games = value
+        self._trade_cache.clear()
+        self._project_all()
+
+    def _check_sources(self):
+        """
+        Discard scored trades if ld.team_stats or ld.player_stats was replaced.
+
+        The calculator already rebuilds its baseline when ``ld.team_stats``
+        is a different dict; this keeps the trade cache in step with it,
+        and re-projects every player when ``ld.player_stats`` is new.
+        In-place edits still need invalidate_baseline().
+        """
+        team_stats, player_stats = self._trade_cache_source
+        if (self.ld.team_stats is not team_stats
+                or self.ld.player_stats is not player_stats):
+            self._trade_cache.clear()
+            self._trade_cache_source = (self.ld.team_stats,
+                                        self.ld.player_stats)
+            if self.ld.player_stats is not player_stats:
+                self._project_all()
 
     def project_player_ros(self, player_key):
         """
@@ -46,19 +195,8 @@ class TradeSimulator:
         Returns:
             dict: {stat_id: projected_remaining_value}
         """
-        stats = self.ld.player_stats.get(player_key, {})
-        gp = stats.get('0', 0)  # GP stat_id = '0'
-        projected = {}
-        for stat_id, total_val in stats.items():
-            # For percentage stats, keep as-is (handled via components)
-            if stat_id in ('5', '8'):
-                projected[stat_id] = total_val
-            elif gp > 0:
-                avg = total_val / gp
-                projected[stat_id] = avg * self.remaining_games
-            else:
-                projected[stat_id] = 0
-        return projected
+        return _project_stats(self.ld.player_stats.get(player_key, {}),
+                              self.remaining_games)
 
     def simulate_trade(self, my_players, their_players, my_team_key, their_team_key):
         """
@@ -66,8 +204,9 @@ class TradeSimulator:
 
         Process:
         1. Project ROS stats for all players involved
-        2. Create modified team_stats by removing/adding projected contributions
-        3. Recalculate Roto standings with modified stats
+        2. Copy the two teams' rows and swap the projected contributions
+        3. Re-rank the two teams against the unchanged baseline, unless
+           no category value crosses a neighbouring team's
         4. Return the net change in Roto score for both teams
 
         For FG% and FT%, we track FGM/FGA and FTM/FTA components to
@@ -91,91 +230,125 @@ class TradeSimulator:
                 'their_players_traded': [player_names],
             }
         """
-        # Calculate current standings
-        old_result = self.calculator.calculate_standings()
-        old_my_score = old_result['roto_scores'].get(my_team_key, 0)
-        old_their_score = old_result['roto_scores'].get(their_team_key, 0)
-
-        # Create a copy of team stats to modify
-        new_team_stats = deepcopy(self.ld.team_stats)
-
-        # Project ROS stats for traded players
-        my_projected = {}
-        for pkey in my_players:
-            my_projected[pkey] = self.project_player_ros(pkey)
-
-        their_projected = {}
-        for pkey in their_players:
-            their_projected[pkey] = self.project_player_ros(pkey)
-
-        # Update team stats:
-        # My team: remove my_players' projections, add their_players' projections
-        # Their team: remove their_players' projections, add my_players' projections
-        for stat_id in self.ld.roto_stat_ids:
-            # Skip percentage stats - handle via components
-            if stat_id in PERCENTAGE_COMPONENTS:
-                continue
-
-            # My team adjustments
-            if my_team_key in new_team_stats:
-                current = new_team_stats[my_team_key].get(stat_id, 0)
-                # Remove my players' projected contribution
-                for pkey in my_players:
-                    current -= my_projected.get(pkey, {}).get(stat_id, 0)
-                # Add their players' projected contribution
-                for pkey in their_players:
-                    current += their_projected.get(pkey, {}).get(stat_id, 0)
-                new_team_stats[my_team_key][stat_id] = current
-
-            # Their team adjustments
-            if their_team_key in new_team_stats:
-                current = new_team_stats[their_team_key].get(stat_id, 0)
-                # Remove their players' projected contribution
-                for pkey in their_players:
-                    current -= their_projected.get(pkey, {}).get(stat_id, 0)
-                # Add my players' projected contribution
-                for pkey in my_players:
-                    current += my_projected.get(pkey, {}).get(stat_id, 0)
-                new_team_stats[their_team_key][stat_id] = current
-
-        # Handle percentage stats via component recalculation
-        for pct_stat_id, components in PERCENTAGE_COMPONENTS.items():
-            made_id = components['made']
-            attempted_id = components['attempted']
-
-            for team_key, remove_players, add_players in [
-                (my_team_key, my_players, their_players),
-                (their_team_key, their_players, my_players),
-            ]:
-                if team_key not in new_team_stats:
-                    continue
-
-                made = new_team_stats[team_key].get(made_id, 0)
-                attempted = new_team_stats[team_key].get(attempted_id, 0)
+        my_delta, their_delta = self._score_trade(
+            my_players, their_players, my_team_key, their_team_key)
+        return self._trade_result(my_players, their_players,
+                                  my_team_key, their_team_key,
+                                  my_delta, their_delta)
+
+    def _score_trade(self, my_players, their_players, my_team_key,
+                     their_team_key, require_gain=False):
+        """
+        Roto score changes for both teams, without building a result dict.
 
-                for pkey in remove_players:
-                    p_stats = self.ld.player_stats.get(pkey, {})
-                    made -= p_stats.get(made_id, 0) * self.remaining_games
-                    attempted -= p_stats.get(attempted_id, 0) * self.remaining_games
+        Results are cached on the unordered pair of (team, players) sides,
+        so evaluating the same trade from the other team's perspective
+        (e.g. running find_best_trades() for each team in turn) reuses it.
+        The cache keeps the TRADE_CACHE_SIZE most recently used trades.
 
-                for pkey in add_players:
-                    p_stats = self.ld.player_stats.get(pkey, {})
-                    made += p_stats.get(made_id, 0) * self.remaining_games
-                    attempted += p_stats.get(attempted_id, 0) * self.remaining_games
+        Args:
+            my_players: List of player_keys I'm trading away
+            their_players: List of player_keys I'm receiving
+            my_team_key: My team's Yahoo key
+            their_team_key: Opponent team's Yahoo key
+            require_gain: If True, return None without re-ranking when
+                          my score certainly does not rise
 
-                new_team_stats[team_key][made_id] = made
-                new_team_stats[team_key][attempted_id] = attempted
+        Returns:
+            tuple: (my_delta, their_delta), or None if pruned
+        """
+        self._check_sources()
+        cache_key = frozenset(((my_team_key, tuple(my_players)),
+                               (their_team_key, tuple(their_players))))
+        cached = self._trade_cache.get(cache_key)
+        if cached is not None:
+            self._trade_cache.move_to_end(cache_key)
+            return cached[my_team_key], cached[their_team_key]
+
+        # Copy only the two rows the trade modifies; the rest of the
+        # league is read straight from the baseline
+        changed = {tk: dict(self.ld.team_stats[tk])
+                   for tk in (my_team_key, their_team_key)
+                   if tk in self.ld.team_stats}
+
+        # Update team stats with one net swap per category: my team gains
+        # (their players - my players), their team loses the same amount
+        width = len(self._counting_stat_ids)
+        gained = _column_sums(
+            [self._ros_rows.get(pkey) for pkey in their_players], width)
+        lost = _column_sums(
+            [self._ros_rows.get(pkey) for pkey in my_players], width)
+        my_row = changed.get(my_team_key)
+        their_row = changed.get(their_team_key)
+        for stat_id, plus, minus in zip(self._counting_stat_ids, gained, lost):
+            net = plus - minus
+            # Neither side contributes (or both contribute equally): the
+            # rows keep their baseline values and rank_delta skips the stat
+            if not net:
+                continue
+            if my_row is not None:
+                my_row[stat_id] = my_row.get(stat_id, 0) + net
+            if their_row is not None:
+                their_row[stat_id] = their_row.get(stat_id, 0) - net
+
+        # Percentages: swap the net made/attempted volumes the same way,
+        # then recompute each team's ratio once
+        if self._pct_stats:
+            width = 2 * len(self._pct_stats)
+            gained = _column_sums(
+                [self._component_rows.get(pkey) for pkey in their_players], width)
+            lost = _column_sums(
+                [self._component_rows.get(pkey) for pkey in my_players], width)
+            for k, (pct_stat_id, made_id, attempted_id) in enumerate(self._pct_stats):
+                made_net = gained[2 * k] - lost[2 * k]
+                attempted_net = gained[2 * k + 1] - lost[2 * k + 1]
+                if not made_net and not attempted_net:
+                    continue
+                for row, sign in ((my_row, 1), (their_row, -1)):
+                    if row is None:
+                        continue
+                    made = row.get(made_id, 0) + sign * made_net
+                    attempted = row.get(attempted_id, 0) + sign * attempted_net
+                    row[made_id] = made
+                    row[attempted_id] = attempted
+                    row[pct_stat_id] = made / attempted if attempted > 0 else 0.0
+
+        # Re-rank only the two teams whose stats changed, skipping that
+        # too when no value moves past a neighbouring team's
+        if require_gain and not self.calculator.could_gain(
+                my_team_key, their_team_key, changed):
+            return None
+        if self.calculator.could_change_ranks(changed):
+            deltas = self.calculator.rank_delta(
+                my_team_key, their_team_key, changed)
+        else:
+            deltas = {my_team_key: 0, their_team_key: 0}
+
+        self._trade_cache[cache_key] = deltas
+        if len(self._trade_cache) > TRADE_CACHE_SIZE:
+            self._trade_cache.popitem(last=False)
+        return deltas[my_team_key], deltas[their_team_key]
+
+    def _trade_result(self, my_players, their_players,
+                      my_team_key, their_team_key, my_delta, their_delta):
+        """
+        Build the simulate_trade() result dict from a pair of deltas.
 
-                # Recalculate percentage
-                if attempted > 0:
-                    new_team_stats[team_key][pct_stat_id] = made / attempted
-                else:
-                    new_team_stats[team_key][pct_stat_id] = 0.0
+        Args:
+            my_players: List of player_keys I'm trading away
+            their_players: List of player_keys I'm receiving
+            my_team_key: My team's Yahoo key
+            their_team_key: Opponent team's Yahoo key
+            my_delta: Change in my Roto score
+            their_delta: Change in their Roto score
 
-        # Recalculate standings with modified stats
-        new_result = self.calculator.calculate_standings(new_team_stats)
-        new_my_score = new_result['roto_scores'].get(my_team_key, 0)
-        new_their_score = new_result['roto_scores'].get(their_team_key, 0)
+        Returns:
+            dict: see simulate_trade()
+        """
+        # Current standings (cached by the calculator until invalidated)
+        old_scores = self.calculator.calculate_standings()['roto_scores']
+        old_my_score = old_scores.get(my_team_key, 0)
+        old_their_score = old_scores.get(their_team_key, 0)
 
         # Get player names for display
         my_names = [
@@ -189,15 +362,54 @@ class TradeSimulator:
 
         return {
             'my_old_score': old_my_score,
-            'my_new_score': new_my_score,
-            'my_delta': new_my_score - old_my_score,
+            'my_new_score': old_my_score + my_delta,
+            'my_delta': my_delta,
             'their_old_score': old_their_score,
-            'their_new_score': new_their_score,
-            'their_delta': new_their_score - old_their_score,
+            'their_new_score': old_their_score + their_delta,
+            'their_delta': their_delta,
             'my_players_traded': my_names,
             'their_players_traded': their_names,
         }
 
+    def _trades_with_opponent(self, my_team_key, my_player_keys, opp_team_key):
+        """
+        Score every 1-for-1 trade with one opponent.
+
+        Each opponent's trades depend only on the baseline standings and
+        the cached projections, so opponents are independent units of
+        work.  Candidates are kept as plain tuples; result dicts are only
+        built for the trades find_best_trades() returns.
+
+        Args:
+            my_team_key: My team's Yahoo key
+            my_player_keys: My active player keys
+            opp_team_key: Opponent team's Yahoo key
+
+        Returns:
+            list of (mutually_beneficial, my_delta, their_delta, my_pk,
+            their_pk, opp_team_key) for trades that increase my Roto score
+        """
+        opp_player_keys = self.ld.get_active_player_keys(opp_team_key)
+        trades = []
+
+        for my_pk in my_player_keys:
+            for their_pk in opp_player_keys:
+                scored = self._score_trade(
+                    [my_pk], [their_pk],
+                    my_team_key, opp_team_key,
+                    require_gain=True,
+                )
+
+                # Must-Have: trade increases MY Roto score
+                if scored is None or scored[0] <= 0:
+                    continue
+                my_delta, their_delta = scored
+
+                # Nice-to-Have flag: doesn't hurt opponent
+                trades.append((their_delta >= 0, my_delta, their_delta,
+                               my_pk, their_pk, opp_team_key))
+        return trades
+
     def find_best_trades(self, my_team_key, max_results=5):
         """
         Iterate through possible 1-for-1 trades and find the best ones.
@@ -217,33 +429,23 @@ class TradeSimulator:
         for opp_team_key in self.ld.teams:
             if opp_team_key == my_team_key:
                 continue
-
-            opp_player_keys = self.ld.get_active_player_keys(opp_team_key)
-
-            for my_pk in my_player_keys:
-                for their_pk in opp_player_keys:
-                    result = self.simulate_trade(
-                        [my_pk], [their_pk],
-                        my_team_key, opp_team_key,
-                    )
-
-                    # Must-Have: trade increases MY Roto score
-                    if result['my_delta'] <= 0:
-                        continue
-
-                    result['opponent_team'] = self.ld.teams.get(opp_team_key, opp_team_key)
-                    result['opponent_team_key'] = opp_team_key
-                    result['my_team'] = self.ld.teams.get(my_team_key, my_team_key)
-
-                    # Nice-to-Have flag: doesn't hurt opponent
-                    result['mutually_beneficial'] = result['their_delta'] >= 0
-
-                    all_trades.append(result)
-
-        # Sort: prioritize mutual benefit, then by my_delta
-        all_trades.sort(
-            key=lambda x: (x['mutually_beneficial'], x['my_delta']),
-            reverse=True,
-        )
-
-        return all_trades[:max_results]
+            all_trades.extend(self._trades_with_opponent(
+                my_team_key, my_player_keys, opp_team_key))
+
+        # Top results: prioritize mutual benefit, then by my_delta.
+        # nlargest is equivalent to a stable descending sort + slice but
+        # avoids sorting candidates that will be discarded.
+        top = heapq.nlargest(max_results, all_trades, key=_by_ranking)
+
+        my_team = self.ld.teams.get(my_team_key, my_team_key)
+        results = []
+        for mutual, my_delta, their_delta, my_pk, their_pk, opp_team_key in top:
+            result = self._trade_result([my_pk], [their_pk],
+                                        my_team_key, opp_team_key,
+                                        my_delta, their_delta)
+            result['opponent_team'] = self.ld.teams.get(opp_team_key, opp_team_key)
+            result['opponent_team_key'] = opp_team_key
+            result['my_team'] = my_team
+            result['mutually_beneficial'] = mutual
+            results.append(result)
+        return results